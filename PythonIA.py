@@ -12,7 +12,33 @@ import numpy as np
 import matplotlib
 # Use Agg backend to ensure headless environments can save figures
 matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Optional import of numba: without it the kernels below still run as plain Python
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except Exception:
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+try:
+    from numba import cuda
+    HAS_NUMBA_CUDA = True
+except Exception:
+    HAS_NUMBA_CUDA = False
+
+try:
+    from scipy.signal import lfilter
+    HAS_SCIPY = True
+except Exception:
+    HAS_SCIPY = False
 
 # --- 1. PARAMETROS DO MODELO (Baseado no seu artigo) ---
 
@@ -28,20 +54,31 @@ xi_p = 123456789
 a = 1103515245
 c = 12345
 m = 2**31 - 1
+# f_ia normalizes X_n by the module modulus, whatever m is passed to rodar_simulacao;
+# multiplying by the precomputed inverse avoids a float division per step
+_INV_M = 1.0 / m
+# the defaults frozen as compile-time constants for the specialized kernel below
+_A_GLC, _C_GLC, _M_GLC = a, c, m
 
 # --- helper functions ---
 
+# table from the article (approx), flattened to (tumor, stage) -> lambda_p
+_LAMBDA_TABLE = {
+    ('prostata', 1): 0.00385, ('prostata', 2): 0.00385,
+    ('prostata', 3): 0.00770, ('prostata', 4): 0.00770,
+    ('mama', 1): 0.00580, ('mama', 2): 0.00580,
+    ('pancreas', 3): 0.01540, ('pancreas', 4): 0.01540,
+}
+# value for a known tumor at a stage outside its table rows
+_LAMBDA_FALLBACK = {'prostata': 0.00385, 'mama': 0.00580, 'pancreas': 0.01540}
+_LAMBDA_DEFAULT = 0.01540
+
+
 def compute_lambda_for_tumor(tumor_type: str, stage: int, alpha: float = 0.0):
     """Return lambda_p for given tumor type and (integer) stage.
     If alpha>0, use formula lambda_p = lambda0 / (1 + alpha*S_p) where S_p is severity in [0,1].
     Otherwise use suggested table values for common tumor types.
     """
-    # table from the article (approx)
-    table = {
-        'prostata': { (1,2): 0.00385, (3,4): 0.00770 },
-        'mama':     { (1,2): 0.00580 },
-        'pancreas': { (3,4): 0.01540 },
-    }
     key = tumor_type.lower()
     if alpha and 0 <= stage <= 4:
         # simple severity mapping: Sp = (stage-1)/3 for stage in 1..4
@@ -50,16 +87,11 @@ def compute_lambda_for_tumor(tumor_type: str, stage: int, alpha: float = 0.0):
         lambda0 = 0.01540
         return lambda0 / (1.0 + alpha * Sp)
 
-    if key in table:
-        mapping = table[key]
-        # choose appropriate bucket
-        for stages, val in mapping.items():
-            if stage in range(stages[0], stages[-1]+1 if isinstance(stages, tuple) else stages+1):
-                return val
-        # fallback to first value
-        return list(mapping.values())[0]
-    # default fallback
-    return 0.01540
+    lam = _LAMBDA_TABLE.get((key, stage))
+    if lam is not None:
+        return lam
+    # fallback to the tumor's first value, then to the default
+    return _LAMBDA_FALLBACK.get(key, _LAMBDA_DEFAULT)
 
 
 def seed_to_glc_x0(xi_p):
@@ -74,6 +106,101 @@ def seed_to_glc_x0(xi_p):
     return X0
 
 
+def _glc_sequence(X0, n, a, c, m):
+    """Return the GLC states X_0..X_{n-1} as a uint32 array (int64 if m does not fit).
+    Uses the closed-form jump X_k = A_k*X_0 + B_k (mod m): the (A_k, B_k) tables are
+    built by doubling, so only log2(n) vectorized passes run instead of n Python steps.
+    """
+    if HAS_NUMBA and m <= 2**31:
+        return _glc_lanes(X0, n, a % m, c % m, m)
+    if n == 0:
+        return np.empty(0, dtype=np.uint32)
+    if m > 2**31:
+        # products would overflow int64; keep the scalar recurrence
+        X_hist = np.empty(n, dtype=np.uint32 if m <= 2**32 else np.int64)
+        # state kept in a Python int: no array read / unboxing per step
+        X_prev = int(X0)
+        X_hist[0] = X_prev
+        for k in range(1, n):
+            X_prev = (a * X_prev + c) % m
+            X_hist[k] = X_prev
+        return X_hist
+
+    a, c = a % m, c % m
+    A = np.empty(n, dtype=np.int64)
+    B = np.empty(n, dtype=np.int64)
+    A[0], B[0] = 1, 0
+    k = 1
+    while k < n:
+        j = min(k, n - k)
+        # jump of k steps: X_{i+k} = A_k*X_i + B_k
+        A_k = (a * int(A[k-1])) % m
+        B_k = (a * int(B[k-1]) + c) % m
+        A[k:k+j] = (A_k * A[:j]) % m
+        B[k:k+j] = (A_k * B[:j] + B_k) % m
+        k += j
+    X_hist = ((A * (X0 % m) + B) % m).astype(np.uint32)
+    X_hist[0] = X0
+    return X_hist
+
+
+GLC_LANES = 8
+
+# 2**31 - 1 is a Mersenne prime, so x % m reduces to shift/mask folds
+_M_MERSENNE31 = 2**31 - 1
+
+
+@njit(cache=True, inline='always')
+def _mod_glc(x, m):
+    """x % m for 0 <= x < 2**62 (any product of two states plus c).
+    For m = 2**31 - 1 this uses two folds x = (x & m) + (x >> 31), which leave
+    x <= m + 1, and one conditional subtract instead of an integer division.
+    """
+    if m == _M_MERSENNE31:
+        x = (x & m) + (x >> 31)
+        x = (x & m) + (x >> 31)
+        return x - m if x >= m else x
+    return x % m
+
+
+@njit(cache=True, inline='always')
+def _glc_lanes(X0, n, a, c, m):
+    """Same stream as _glc_sequence, produced by GLC_LANES interleaved substreams.
+    Lane l holds X_{i*GLC_LANES + l}; every lane advances with the GLC_LANES-step jump
+    (a^L, c*(a^L-1)/(a-1)) mod m, so the inner lane loop has no carried dependency
+    and LLVM can vectorize it. States are computed in int64 and stored as uint32.
+    """
+    X_hist = np.empty(n, dtype=np.uint32)
+    if n == 0:
+        return X_hist
+    lanes = np.empty(GLC_LANES, dtype=np.int64)
+    x = np.int64(X0)
+    X_hist[0] = x
+    x = _mod_glc(x, m)
+    A_L = np.int64(1)
+    B_L = np.int64(0)
+    for l in range(GLC_LANES):
+        lanes[l] = x
+        x = _mod_glc(a * x + c, m)
+        A_L = _mod_glc(a * A_L, m)
+        B_L = _mod_glc(a * B_L + c, m)
+    for l in range(1, min(GLC_LANES, n)):
+        X_hist[l] = lanes[l]
+
+    n_blocos = n // GLC_LANES
+    for i in range(1, n_blocos):
+        base = i * GLC_LANES
+        for l in range(GLC_LANES):
+            lanes[l] = _mod_glc(A_L * lanes[l] + B_L, m)
+            X_hist[base + l] = lanes[l]
+    resto = n - n_blocos * GLC_LANES
+    if n_blocos > 0 and resto > 0:
+        base = n_blocos * GLC_LANES
+        for l in range(resto):
+            X_hist[base + l] = _mod_glc(A_L * lanes[l] + B_L, m)
+    return X_hist
+
+
 # --- 2. FUNCOES PRINCIPAIS (IA e ESTADO INICIAL) ---
 
 def psi(semente_paciente):
@@ -81,63 +208,275 @@ def psi(semente_paciente):
     return (int(semente_paciente) % 100) / 100.0
 
 
+@njit(cache=True, fastmath=True)
+def _f_ia_scalar(ruido_mutacao):
+    impacto_base = 0.05
+    # select-then-add instead of two returns: lowers to a blend, no branch
+    return (ruido_mutacao * 5 if ruido_mutacao > 0.95 else ruido_mutacao) + impacto_base
+
+
+def _f_ia_vec(ruido):
+    """Branchless f_ia over an array of normalized GLC states."""
+    return np.where(ruido > 0.95, ruido * 5, ruido) + 0.05
+
+
 def f_ia(memoria_passada, tempo, semente_paciente, estado_aleatorio):
+    # memoria_passada is kept for API compatibility only; the impact does not read it
     # Normalize random state
-    ruido_mutacao = estado_aleatorio / m
-    impacto_base = 0.05
-    if ruido_mutacao > 0.95:
-        return impacto_base + ruido_mutacao * 5
-    return impacto_base + ruido_mutacao
+    ruido_mutacao = estado_aleatorio * _INV_M
+    return _f_ia_scalar(ruido_mutacao)
 
 
 # --- 3. SIMULATION ---
 
+# columns of the per-step history buffer (one row per step, so each step writes one cache line)
+_COL_X, _COL_M, _COL_F = 0, 1, 2
+# histories are stored in single precision; the recurrences still accumulate in float64
+HIST_DTYPE = np.float32
+
+
+@njit(cache=True, fastmath=True, inline='always')
+def _rodar_simulacao_nb(n_passos, dt, decaimento, X0, a, c, m, x_0, inv_m):
+    """Whole recurrence in nopython mode; returns the (n_passos, 3) history buffer and X_hist."""
+    X_hist = _glc_lanes(X0, n_passos, a, c, m)
+    hist = np.zeros((n_passos, 3), dtype=HIST_DTYPE)
+    if n_passos == 0:
+        return hist, X_hist
+
+    hist[0, _COL_X] = x_0
+    hist[0, _COL_F] = _f_ia_scalar(X_hist[0] * inv_m)
+
+    m_n = 0.0
+    for n in range(1, n_passos):
+        f_n = _f_ia_scalar(X_hist[n] * inv_m)
+        m_n = decaimento * m_n + f_n * dt
+        hist[n, _COL_X] = x_0 + m_n
+        hist[n, _COL_M] = m_n
+        hist[n, _COL_F] = f_n
+    return hist, X_hist
+
+
+@njit(cache=True, fastmath=True)
+def _rodar_simulacao_glc(n_passos, dt, decaimento, X0, x_0, inv_m):
+    """_rodar_simulacao_nb specialized for the default GLC (a, c, m).
+    Both kernels are inlined here with the constants folded in, so the m test in
+    _mod_glc disappears and only the Mersenne fold is left in the loop.
+    """
+    return _rodar_simulacao_nb(n_passos, dt, decaimento, X0, _A_GLC, _C_GLC, _M_GLC, x_0, inv_m)
+
+
+def _eixo_tempos(n_dias, dt):
+    """Time axis as float32, same length as np.arange(0, n_dias, dt)."""
+    n_passos = max(0, int(np.ceil(n_dias / dt)))
+    return np.arange(n_passos, dtype=np.float32) * np.float32(dt)
+
+
 def rodar_simulacao(n_dias, dt, lambda_p, xi_p, a, c, m):
     """Runs the recursive simulation and returns times, x_hist, f_hist, m_hist, X_hist"""
-    tempos = np.arange(0, n_dias, dt)
+    tempos = _eixo_tempos(n_dias, dt)
     n_passos = len(tempos)
-    X_hist = np.zeros(n_passos, dtype=np.int64)
-    f_hist = np.zeros(n_passos)
-    m_hist = np.zeros(n_passos)
-    x_hist = np.zeros(n_passos)
-
+    X0 = seed_to_glc_x0(xi_p)
     x_0 = psi(xi_p)
-    x_hist[0] = x_0
-    m_hist[0] = 0
-    X_hist[0] = seed_to_glc_x0(xi_p)
-    f_hist[0] = f_ia(0, 0, xi_p, X_hist[0])
 
-    decaimento = np.exp(-lambda_p * dt)
-
-    for n in range(1, n_passos):
-        X_n = (a * int(X_hist[n-1]) + c) % m
-        f_n = f_ia(x_hist[:n], tempos[n], xi_p, X_n)
-        m_n = decaimento * m_hist[n-1] + f_n * dt
-        x_n = x_0 + m_n
-        X_hist[n] = X_n
-        f_hist[n] = f_n
-        m_hist[n] = m_n
-        x_hist[n] = x_n
+    # loop constants bound once as float64 (dt usually arrives as a Python int)
+    dt_f = float(dt)
+    lambda_p = np.float64(lambda_p)
+    decaimento = np.float64(np.exp(-lambda_p * dt_f))
+
+    if HAS_NUMBA and (a, c, m) == (_A_GLC, _C_GLC, _M_GLC):
+        hist, X_hist = _rodar_simulacao_glc(n_passos, dt_f, decaimento, np.int64(X0), float(x_0), _INV_M)
+        return tempos, hist[:, _COL_X], hist[:, _COL_F], hist[:, _COL_M], X_hist
+    if HAS_NUMBA and m <= 2**31:
+        hist, X_hist = _rodar_simulacao_nb(
+            n_passos, dt_f, decaimento, np.int64(X0),
+            np.int64(a % m), np.int64(c % m), np.int64(m), float(x_0), _INV_M)
+        return tempos, hist[:, _COL_X], hist[:, _COL_F], hist[:, _COL_M], X_hist
+
+    hist = np.zeros((n_passos, 3), dtype=HIST_DTYPE)
+    x_hist = hist[:, _COL_X]
+    m_hist = hist[:, _COL_M]
+    f_hist = hist[:, _COL_F]
+
+    # the GLC does not depend on the model state, so the whole stream is generated up front
+    X_hist = _glc_sequence(X0, n_passos, a, c, m)
+
+    # f_ia over the whole stream at once
+    f_hist[:] = _f_ia_vec(X_hist * _INV_M)
+
+    # m_0 = 0 and m_n = decaimento*m_{n-1} + dt*f_n is a first-order IIR filter over f_1..f_{n-1}
+    if HAS_SCIPY and n_passos > 1:
+        m_hist[1:] = lfilter([dt_f], [1.0, -decaimento], f_hist[1:])
+    else:
+        m_prev = 0.0
+        for n in range(1, n_passos):
+            m_prev = decaimento * m_prev + f_hist[n] * dt_f
+            m_hist[n] = m_prev
+    x_hist[:] = x_0 + m_hist
 
     return tempos, x_hist, f_hist, m_hist, X_hist
 
 
+@njit(cache=True, fastmath=True, parallel=True)
+def _rodar_ensemble_nb(n_passos, dt, decaimento, X0s, x0s, a, c, m, inv_m):
+    """One independent simulation per seed, in parallel; outputs are (n_passos, n_seeds)."""
+    n_seeds = X0s.shape[0]
+    x_ens = np.empty((n_passos, n_seeds), dtype=HIST_DTYPE)
+    f_ens = np.empty((n_passos, n_seeds), dtype=HIST_DTYPE)
+    if n_passos == 0:
+        return x_ens, f_ens
+    for j in prange(n_seeds):
+        X_n = X0s[j]
+        x_0 = x0s[j]
+        f_ens[0, j] = _f_ia_scalar(X_n * inv_m)
+        x_ens[0, j] = x_0
+        X_n = _mod_glc(X_n, m)
+        m_n = 0.0
+        for n in range(1, n_passos):
+            X_n = _mod_glc(a * X_n + c, m)
+            f_n = _f_ia_scalar(X_n * inv_m)
+            m_n = decaimento * m_n + f_n * dt
+            f_ens[n, j] = f_n
+            x_ens[n, j] = x_0 + m_n
+    return x_ens, f_ens
+
+
+def rodar_ensemble(seeds, n_dias, dt, lambda_p, a, c, m):
+    """Runs one simulation per seed xi_p (Monte-Carlo sweep) and returns times, x_ens, f_ens.
+    x_ens and f_ens have shape (n_passos, len(seeds)): column j is the run for seeds[j].
+    """
+    tempos = _eixo_tempos(n_dias, dt)
+    n_passos = len(tempos)
+    X0s = np.array([seed_to_glc_x0(s) for s in seeds], dtype=np.int64)
+    x0s = np.array([psi(s) for s in seeds], dtype=np.float64)
+
+    if HAS_NUMBA and m <= 2**31:
+        dt_f = float(dt)
+        decaimento = np.float64(np.exp(-np.float64(lambda_p) * dt_f))
+        x_ens, f_ens = _rodar_ensemble_nb(n_passos, dt_f, decaimento, X0s, x0s,
+                                          np.int64(a % m), np.int64(c % m), np.int64(m), _INV_M)
+        return tempos, x_ens, f_ens
+
+    x_ens = np.empty((n_passos, len(X0s)), dtype=HIST_DTYPE)
+    f_ens = np.empty((n_passos, len(X0s)), dtype=HIST_DTYPE)
+    for j, s in enumerate(seeds):
+        _, x_ens[:, j], f_ens[:, j], _, _ = rodar_simulacao(n_dias, dt, lambda_p, s, a, c, m)
+    return tempos, x_ens, f_ens
+
+
+_SIM_KERNEL_CUDA = None
+
+
+def _sim_kernel_cuda():
+    """Build (once) the CUDA kernel: one thread per seed, writing row n of the outputs at step n."""
+    global _SIM_KERNEL_CUDA
+    if _SIM_KERNEL_CUDA is not None:
+        return _SIM_KERNEL_CUDA
+
+    @cuda.jit
+    def sim_kernel(out_x, out_f, X0s, x0s, n_passos, dt, decaimento, a, c, m, inv_m):
+        j = cuda.grid(1)
+        if j >= X0s.shape[0] or n_passos == 0:
+            return
+        X_n = X0s[j]
+        x_0 = x0s[j]
+        ruido = X_n * inv_m
+        out_f[0, j] = (ruido * 5 if ruido > 0.95 else ruido) + 0.05
+        out_x[0, j] = x_0
+        X_n = X_n % m
+        m_n = 0.0
+        for n in range(1, n_passos):
+            X_n = a * X_n + c
+            if m == _M_MERSENNE31:
+                X_n = (X_n & m) + (X_n >> 31)
+                X_n = (X_n & m) + (X_n >> 31)
+                if X_n >= m:
+                    X_n -= m
+            else:
+                X_n = X_n % m
+            ruido = X_n * inv_m
+            f_n = (ruido * 5 if ruido > 0.95 else ruido) + 0.05
+            m_n = decaimento * m_n + f_n * dt
+            # threads of a warp hold consecutive seeds, so these stores coalesce
+            out_f[n, j] = f_n
+            out_x[n, j] = x_0 + m_n
+
+    _SIM_KERNEL_CUDA = sim_kernel
+    return sim_kernel
+
+
+def rodar_ensemble_cuda(seeds, n_dias, dt, lambda_p, a, c, m, threads_por_bloco=256):
+    """GPU version of rodar_ensemble; returns times, x_ens, f_ens as float32 (n_passos, n_seeds).
+    Falls back to rodar_ensemble when numba.cuda or a CUDA device is not available.
+    """
+    if not (HAS_NUMBA_CUDA and m <= 2**31 and cuda.is_available()):
+        return rodar_ensemble(seeds, n_dias, dt, lambda_p, a, c, m)
+
+    tempos = _eixo_tempos(n_dias, dt)
+    n_passos = len(tempos)
+    n_seeds = len(seeds)
+    X0s = np.array([seed_to_glc_x0(s) for s in seeds], dtype=np.int64)
+    x0s = np.array([psi(s) for s in seeds], dtype=np.float64)
+    dt_f = float(dt)
+    decaimento = float(np.exp(-float(lambda_p) * dt_f))
+
+    out_x = cuda.device_array((n_passos, n_seeds), dtype=HIST_DTYPE)
+    out_f = cuda.device_array((n_passos, n_seeds), dtype=HIST_DTYPE)
+    if n_seeds > 0:
+        blocos = (n_seeds + threads_por_bloco - 1) // threads_por_bloco
+        _sim_kernel_cuda()[blocos, threads_por_bloco](
+            out_x, out_f, cuda.to_device(X0s), cuda.to_device(x0s), n_passos, dt_f, decaimento,
+            np.int64(a % m), np.int64(c % m), np.int64(m), _INV_M)
+    return tempos, out_x.copy_to_host(), out_f.copy_to_host()
+
+
 def run_simulation_with_detection(n_dias, dt, lambda_p, xi_p, a, c, m, threshold=0.5):
     """Run simulation and detect mutation events where f_n > threshold.
     Returns (tempos, x_hist, f_hist, m_hist, X_hist, events)
     events is a list of dicts: {'step': n, 'time': t, 'f': f_n, 'X': X_n}
     """
     tempos, x_hist, f_hist, m_hist, X_hist = rodar_simulacao(n_dias, dt, lambda_p, xi_p, a, c, m)
-    events = []
-    for n, f_n in enumerate(f_hist):
-        if f_n > threshold:
-            events.append({'step': int(n), 'time': float(tempos[n]), 'f': float(f_n), 'X': int(X_hist[n])})
+    # one vectorized compare over f_hist; only the hits pay for a dict
+    idx = np.flatnonzero(f_hist > threshold)
+    events = [{'step': int(n), 'time': float(t_n), 'f': float(f_n), 'X': int(X_n)}
+              for n, t_n, f_n, X_n in zip(idx, tempos[idx], f_hist[idx], X_hist[idx])]
     return tempos, x_hist, f_hist, m_hist, X_hist, events
 
 
+def _reduzir_para_grafico(tempos, x_hist, f_hist, max_bins=2000):
+    """Downsample the series to at most max_bins display bins before plotting.
+    Returns (t_x, x, t_f, f, largura): x is sampled at each bin start, f is the bin mean
+    drawn as one bar per bin, so the number of Rectangles no longer grows with n_dias.
+    """
+    n = len(tempos)
+    if n <= max_bins:
+        return tempos, x_hist, tempos, f_hist, 0.8
+    idx = np.linspace(0, n, max_bins + 1, dtype=int)
+    inicio, tamanho = idx[:-1], np.diff(idx)
+    f_b = np.add.reduceat(f_hist, inicio) / tamanho
+    passo = (tempos[-1] - tempos[0]) / (n - 1)
+    t_centro = tempos[inicio] + (tamanho - 1) * passo / 2
+    return tempos[inicio], x_hist[inicio], t_centro, f_b, tamanho * passo * 0.8
+
+
+_FIGURA_DASHBOARD = None
+
+
+def _figura_dashboard():
+    """Return the reusable dashboard Figure (Agg canvas attached), cleared for a new plot.
+    Uses the OO API directly, so no pyplot state machine is involved on repeated calls.
+    """
+    global _FIGURA_DASHBOARD
+    if _FIGURA_DASHBOARD is None:
+        _FIGURA_DASHBOARD = Figure(figsize=(14, 7))
+        FigureCanvasAgg(_FIGURA_DASHBOARD)
+    else:
+        _FIGURA_DASHBOARD.clear()
+    return _FIGURA_DASHBOARD
+
+
 def gerar_grafico(tempos, x_hist, f_hist):
     """
-    Gera o "Dashboard" estatico. Valida entradas, salva com caminho absoluto e fecha figura.
+    Gera o "Dashboard" estatico. Valida entradas e salva com caminho absoluto.
     """
     print("Gerando grafico...")
 
@@ -149,7 +488,10 @@ def gerar_grafico(tempos, x_hist, f_hist):
         print(f"Aviso: arrays vazios. len(tempos)={len(tempos)}, len(x_hist)={len(x_hist)}, len(f_hist)={len(f_hist)}")
         return
 
-    fig, ax1 = plt.subplots(figsize=(14, 7))
+    t_x, x_plot, t_f, f_plot, largura = _reduzir_para_grafico(tempos, x_hist, f_hist)
+
+    fig = _figura_dashboard()
+    ax1 = fig.add_subplot(111)
 
     # Titulo do Dashboard
     fig.suptitle("Simulacao do Modelo Volterra-Stieltjes com Memoria Finita", fontsize=16)
@@ -158,7 +500,7 @@ def gerar_grafico(tempos, x_hist, f_hist):
     color = 'tab:blue'
     ax1.set_xlabel('Tempo (dias)', fontsize=12)
     ax1.set_ylabel('Estado do Paciente (x_n)', color=color, fontsize=12)
-    ax1.plot(tempos, x_hist, color=color, label="Estado x_n (Evolucao)")
+    ax1.plot(t_x, x_plot, color=color, label="Estado x_n (Evolucao)")
     ax1.tick_params(axis='y', labelcolor=color)
     ax1.grid(True, linestyle='--', alpha=0.6)
 
@@ -166,14 +508,13 @@ def gerar_grafico(tempos, x_hist, f_hist):
     ax2 = ax1.twinx()
     color = 'tab:red'
     ax2.set_ylabel('Impacto da IA (f_n)', color=color, fontsize=12)
-    ax2.bar(tempos, f_hist, color=color, alpha=0.3, label="Impacto f_n (Mutacoes)")
+    ax2.bar(t_f, f_plot, width=largura, color=color, alpha=0.3, label="Impacto f_n (Mutacoes)")
     ax2.tick_params(axis='y', labelcolor=color)
 
-    # Salvar o grafico em caminho absoluto e fechar figura
+    # Salvar o grafico em caminho absoluto (a figura e reutilizada na proxima chamada)
     nome_arquivo = os.path.join(os.getcwd(), "dashboard_simulacao_paciente.png")
     fig.tight_layout(rect=[0, 0.03, 1, 0.95])
-    plt.savefig(nome_arquivo)
-    plt.close(fig)
+    fig.canvas.print_png(nome_arquivo)
 
     # Tentar abrir automaticamente no Windows
     try:
@@ -1,18 +1,35 @@
 ﻿# MIT License (c)2025 Andre Galberto - see LICENSE.md for full text
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
 import pandas as pd
 import tempfile
 import os
 import shutil
-import subprocess
+import asyncio
+import threading
 import sys
 import time
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 import ast
 import json
-import plotly.express as px
-import plotly.graph_objects as go # Para gráficos mais complexos
+
+# orjson (extensão C) é opcional; sem ele usa o json da biblioteca padrão
+try:
+ import orjson
+ HAS_ORJSON = True
+except ImportError:
+ HAS_ORJSON = False
+
+# pyarrow é opcional; sem ele o histórico vem da lista 'history' do JSON
+try:
+ import pyarrow.parquet as pq
+ HAS_PYARROW = True
+except ImportError:
+ HAS_PYARROW = False
+# sequências em buffer Arrow contíguo quando há pyarrow; senão o dtype string do pandas
+PROT_DTYPE = 'string[pyarrow]' if HAS_PYARROW else 'string'
 
 # --- Definições Globais e Funções Auxiliares ---
 
@@ -50,35 +67,343 @@ AMINO_ACID_INFO = {
  '*': {'name': 'Stop Codon', 'prop': 'Fim'},
 }
 
+# As mesmas informações em tabelas de 256 posições indexadas pelo código ASCII
+# (maiúscula e minúscula); posições sem aminoácido ficam com 'Inválido' / 'N/A'
+NAME_TABLE = np.array(['Inválido'] * 256, dtype=object)
+PROP_TABLE = np.array(['N/A'] * 256, dtype=object)
+# nomes dos rótulos de mutação: só o código exato; senão o próprio caractere
+_MUT_NAME_TABLE = np.array([chr(i) for i in range(256)], dtype=object)
+for _k, _v in AMINO_ACID_INFO.items():
+ for _code in {_k, _k.lower()}:
+  NAME_TABLE[ord(_code)] = _v['name']
+  PROP_TABLE[ord(_code)] = _v['prop']
+ _MUT_NAME_TABLE[ord(_k)] = _v['name']
+
+def _aa_index(aa_code):
+ """Índice nas tabelas acima; 0 (inválido) para o que não for um único caractere latin-1."""
+ return ord(aa_code) if len(aa_code) == 1 and ord(aa_code) < 256 else 0
+
 def get_aa_info(aa_code):
  """Retorna nome e propriedade do aminoácido."""
- info = AMINO_ACID_INFO.get(aa_code.upper(), {'name': 'Inválido', 'prop': 'N/A'})
- return f"{info['name']} ({info['prop']})"
+ i = _aa_index(aa_code)
+ return f"{NAME_TABLE[i]} ({PROP_TABLE[i]})"
 
-def find_mutation_details(original_prot, mutated_prot):
- """Encontra a primeira mudança entre duas sequências e retorna detalhes."""
- if not isinstance(original_prot, str) or not isinstance(mutated_prot, str):
- return "N/A"
- 
+@lru_cache(maxsize=32768)
+def _find_mut(original_prot, mutated_prot):
+ """Corpo de find_mutation_details, memoizado por par (original, mutada): mutantes
+ repetidos (comuns na busca) não refazem a comparação."""
  # Lidar com comprimentos diferentes (ex: stop codon prematuro)
  min_len = min(len(original_prot), len(mutated_prot))
- 
+
  for i in range(min_len):
- if original_prot[i] != mutated_prot[i]:
- orig_info = AMINO_ACID_INFO.get(original_prot[i], {'name': original_prot[i]})
- mut_info = AMINO_ACID_INFO.get(mutated_prot[i], {'name': mutated_prot[i]})
- return f"Pos {i+1}: {orig_info['name']} ({original_prot[i]}) -> {mut_info['name']} ({mutated_prot[i]})"
- 
+  if original_prot[i] != mutated_prot[i]:
+   orig_info = AMINO_ACID_INFO.get(original_prot[i], {'name': original_prot[i]})
+   mut_info = AMINO_ACID_INFO.get(mutated_prot[i], {'name': mutated_prot[i]})
+   return f"Pos {i+1}: {orig_info['name']} ({original_prot[i]}) -> {mut_info['name']} ({mutated_prot[i]})"
+
  # Se nenhuma mudança encontrada nos primeiros min_len caracteres
  if len(original_prot) != len(mutated_prot):
- if len(mutated_prot) < len(original_prot):
- stop_info = AMINO_ACID_INFO.get(original_prot[min_len], {'name': original_prot[min_len]})
- return f"Stop Prematuro? Esperado {stop_info['name']} ({original_prot[min_len]}) na pos {min_len+1}"
- else:
- return f"Extensão? Seq. mutada mais longa."
+  if len(mutated_prot) < len(original_prot):
+   stop_info = AMINO_ACID_INFO.get(original_prot[min_len], {'name': original_prot[min_len]})
+   return f"Stop Prematuro? Esperado {stop_info['name']} ({original_prot[min_len]}) na pos {min_len+1}"
+  else:
+   return f"Extensão? Seq. mutada mais longa."
 
  return "Sequências idênticas" # Nenhuma mudança encontrada
 
+def find_mutation_details(original_prot, mutated_prot):
+ """Encontra a primeira mudança entre duas sequências e retorna detalhes."""
+ if not isinstance(original_prot, str) or not isinstance(mutated_prot, str):
+  return "N/A"
+ return _find_mut(original_prot, mutated_prot)
+
+def find_mutation_details_vec(original_prot, mutated_prots):
+ """find_mutation_details aplicada a uma sequência de proteínas mutadas de uma vez.
+ As proteínas viram uma matriz (N, L) de bytes comparada com a original; os rótulos
+ são formatados uma vez por (posição, aminoácido) distinto. Retorna um array object."""
+ prots = list(mutated_prots)
+ out = np.full(len(prots), "N/A", dtype=object)
+ if not isinstance(original_prot, str):
+  return out
+ idx_ok = np.array([k for k, p in enumerate(prots) if isinstance(p, str)], dtype=np.int64)
+ if idx_ok.size == 0:
+  return out
+ seqs = [prots[k] for k in idx_ok]
+ lens = np.array([len(p) for p in seqs], dtype=np.int64)
+ L = max(len(original_prot), int(lens.max()))
+ try:
+  orig = np.zeros(L, dtype=np.uint8)
+  orig[:len(original_prot)] = np.frombuffer(original_prot.encode('ascii'), dtype=np.uint8)
+  mat = np.frombuffer(''.join(p.ljust(L, '\0') for p in seqs).encode('ascii'), dtype=np.uint8)
+ except UnicodeEncodeError:
+  # fora do ASCII a posição do byte não é a do caractere: usa a versão escalar
+  out[idx_ok] = [find_mutation_details(original_prot, p) for p in seqs]
+  return out
+ mat = mat.reshape(len(seqs), L)
+
+ # só conta diferenças antes do fim da sequência mais curta (o resto é preenchimento)
+ min_len = np.minimum(lens, len(original_prot))
+ diff = (mat != orig) & (np.arange(L) < min_len[:, None])
+ has_sub = diff.any(axis=1)
+
+ labels = np.empty(len(seqs), dtype=object)
+ labels[:] = "Sequências idênticas"
+ labels[~has_sub & (lens > len(original_prot))] = "Extensão? Seq. mutada mais longa."
+ stop = ~has_sub & (lens < len(original_prot))
+ if stop.any():
+  ends, inv = np.unique(lens[stop], return_inverse=True)
+  o_u = orig[ends]
+  textos = [f"Stop Prematuro? Esperado {nome} ({chr(o)}) na pos {e+1}"
+   for e, o, nome in zip(ends.tolist(), o_u.tolist(), _MUT_NAME_TABLE[o_u])]
+  labels[stop] = np.array(textos, dtype=object)[inv]
+ if has_sub.any():
+  rows = np.flatnonzero(has_sub)
+  pos = diff[rows].argmax(axis=1)
+  chaves, inv = np.unique(pos * 256 + mat[rows, pos], return_inverse=True)
+  p_u, mu_u = np.divmod(chaves, 256)
+  o_u = orig[p_u]
+  textos = [f"Pos {p+1}: {nome_o} ({chr(o)}) -> {nome_mu} ({chr(mu)})"
+   for p, o, mu, nome_o, nome_mu in zip(p_u.tolist(), o_u.tolist(), mu_u.tolist(),
+                                        _MUT_NAME_TABLE[o_u], _MUT_NAME_TABLE[mu_u])]
+  labels[rows] = np.array(textos, dtype=object)[inv]
+ out[idx_ok] = labels
+ return out
+
+def read_json(path):
+ """Carrega um arquivo JSON (com orjson quando disponível)."""
+ if HAS_ORJSON:
+  with open(path, 'rb') as f:
+   return orjson.loads(f.read())
+ with open(path, 'r', encoding='utf-8') as f:
+  return json.load(f)
+
+def write_json(obj, path):
+ """Grava obj como JSON indentado em UTF-8 (com orjson quando disponível)."""
+ if HAS_ORJSON:
+  with open(path, 'wb') as f:
+   f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+ else:
+  with open(path, 'w', encoding='utf-8') as f:
+   json.dump(obj, f, ensure_ascii=False, indent=2)
+
+@st.cache_data(show_spinner=False)
+def histogram_counts(values, bins):
+ """np.histogram cacheado; o array entra na chave do cache pelo seu conteúdo."""
+ return np.histogram(values, bins=bins)
+
+# --- Figuras Plotly, cacheadas pelo conteúdo dos dados ---
+# teto de marcadores enviados ao navegador no gráfico de progresso
+MAX_SCATTER_POINTS = 200_000
+# Argumentos com prefixo _ não entram no hash do st.cache_data: o DataFrame vai
+# sem hash e a chave é o hash por linha calculado em frame_key.
+@lru_cache(maxsize=None)
+def _get_go():
+ """plotly.graph_objects, importado só quando a primeira figura é montada."""
+ import plotly.graph_objects as go # Para gráficos mais complexos
+ return go
+
+def frame_key(df):
+ """Chave de cache para um DataFrame: hash vetorizado das linhas (inclui colunas de texto)."""
+ return pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()
+
+@st.cache_data(show_spinner=False)
+def build_volterra_fig(key, _df, color_estado, color_impacto):
+ """Estado (linha, eixo esquerdo) e impacto (barras, eixo direito) da simulação Volterra."""
+ go = _get_go()
+ fig = go.Figure()
+ # Linha para Estado (x_n) no eixo Y esquerdo
+ fig.add_trace(go.Scatter(x=_df['Tempo (dias)'], y=_df['Estado (x_n)'],
+  mode='lines', name='Estado (x_n)', yaxis='y1',
+  line=dict(color=color_estado)))
+ # Barras para Impacto (f_n) no eixo Y direito
+ fig.add_trace(go.Bar(x=_df['Tempo (dias)'], y=_df['Impacto (f_n)'],
+  name='Impacto (f_n)', yaxis='y2',
+  marker=dict(color=color_impacto, opacity=0.6)))
+ # Configurar layout com dois eixos Y
+ fig.update_layout(
+  title="Evolução Temporal: Estado vs. Impacto",
+  xaxis_title="Tempo (dias)",
+  yaxis=dict(
+   title="Estado (x_n)",
+   titlefont=dict(color="royalblue"),
+   tickfont=dict(color="royalblue")
+  ),
+  yaxis2=dict(
+   title="Impacto (f_n)",
+   titlefont=dict(color="crimson"),
+   tickfont=dict(color="crimson"),
+   overlaying="y",
+   side="right",
+   showgrid=False # Não mostrar grid para o segundo eixo
+  ),
+  legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
+  hovermode="x unified" # Mostra info de ambas as traces ao passar o mouse
+ )
+ return fig
+
+@st.cache_data(show_spinner=False)
+def build_progress_fig(key, _df_hist, color_progress):
+ """Impacto de cada iteração (WebGL) e o melhor impacto acumulado."""
+ # pontos demais para o navegador: mostra uma amostra regular de no máximo MAX_SCATTER_POINTS
+ df_plot = _df_hist
+ if len(_df_hist) > MAX_SCATTER_POINTS:
+  df_plot = _df_hist.iloc[::(len(_df_hist) + MAX_SCATTER_POINTS - 1) // MAX_SCATTER_POINTS]
+ # o melhor acumulado é uma escada: bastam os degraus (e o último ponto) com line_shape='hv'
+ melhor = _df_hist['melhor_impacto_acumulado'].to_numpy()
+ degraus = np.r_[True, melhor[1:] != melhor[:-1]]
+ degraus[-1] = True
+ df_melhor = _df_hist[degraus]
+ go = _get_go()
+ fig = go.Figure()
+ # WebGL (Scattergl): o SVG do go.Scatter fica lento com dezenas de milhares de marcadores
+ fig.add_trace(go.Scattergl(x=df_plot['i'], y=df_plot['impacto'], mode='markers', name='Impacto da Iteração',
+  marker=dict(color='lightblue', size=5, opacity=0.7),
+  customdata=df_plot[['prot']],
+  hovertemplate="Iter: %{x}<br>Impacto: %{y:.4f}<br>Prot: %{customdata[0]}<extra></extra>"))
+ fig.add_trace(go.Scatter(x=df_melhor['i'], y=df_melhor['melhor_impacto_acumulado'], mode='lines', name='Melhor Impacto Acumulado',
+  line=dict(color=color_progress, width=2, shape='hv')))
+ fig.update_layout(title="Progresso da Otimização: Impacto vs Iteração",
+  xaxis_title="Iteração (i)", yaxis_title="Impacto Previsto (f)",
+  hovermode="closest")
+ return fig
+
+@st.cache_data(show_spinner=False)
+def build_hist_fig(counts, edges, color):
+ """Histograma já binado (saída de histogram_counts) como barras contíguas."""
+ go = _get_go()
+ fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+  marker_color=color))
+ fig.update_layout(title='Distribuição dos Impactos Filtrados', xaxis_title='impacto',
+  yaxis_title='count', bargap=0)
+ return fig
+
+def _folder_mtime(folder):
+ """mtime da pasta (muda quando arquivos são criados/removidos); 0 se não existir."""
+ try:
+  return os.stat(folder).st_mtime
+ except OSError:
+  return 0
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _list_fastas(folder, mtime):
+ """Arquivos FASTA da pasta; mtime só serve de chave do cache."""
+ return sorted(f for f in os.listdir(folder) if f.endswith(('.fasta', '.fa', '.fna')))
+
+@st.cache_data(show_spinner=False)
+def load_result(path, mtime, columns=None):
+ """Histórico salvo em Parquet pelo simular_anticorpo.py (cache por caminho+mtime).
+ Com columns, só essas colunas são lidas do arquivo."""
+ if columns is not None:
+  names = pq.ParquetFile(path).schema_arrow.names
+  columns = [c for c in columns if c in names]
+ return pq.read_table(path, columns=columns).to_pandas()
+
+def load_history(result, columns=None):
+ """DataFrame do histórico de um resultado: do Parquet indicado em 'history_parquet'
+ ou, em execuções antigas (ou sem pyarrow), da lista 'history' do próprio JSON.
+ columns (tupla) restringe as colunas carregadas; as ausentes são ignoradas."""
+ hist_path = result.get('history_parquet')
+ if HAS_PYARROW and hist_path and os.path.exists(hist_path):
+  return load_result(hist_path, os.path.getmtime(hist_path), columns)
+ df = pd.DataFrame(result.get('history', []))
+ if columns is not None:
+  df = df[[c for c in columns if c in df.columns]]
+ return df
+
+# --- Simulador de anticorpo em segundo plano ---
+# linhas de stdout guardadas em memória por execução / mostradas na página
+LOG_BUFFER_LINES = 200
+LOG_TAIL_LINES = 20
+# intervalo de atualização do painel de status/log enquanto o simulador roda
+SIM_POLL_SECONDS = 2.0
+
+async def _run_sim_process(job, cmd, cwd, out_log, err_log):
+ with open(out_log, 'wb') as out_f, open(err_log, 'wb') as err_f:
+  try:
+   proc = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE,
+    stderr=err_f, cwd=cwd)
+  except Exception as e:
+   job['error'] = e
+   return
+  job['pid'] = proc.pid
+  job['started'].set()
+  # stdout vem pelo pipe: as linhas vão para job['log'] (lido pela UI, sem disco)
+  # e o arquivo de log é só uma cópia. Lê em blocos porque uma linha pode ser
+  # maior que o limite do readline (o 'Resultado:' final traz o histórico todo).
+  resto = b''
+  while True:
+   bloco = await proc.stdout.read(1 << 16)
+   if not bloco:
+    break
+   out_f.write(bloco)
+   linhas = (resto + bloco).split(b'\n')
+   resto = linhas.pop()
+   with job['log_lock']:
+    job['log'].extend(l.decode('utf-8', errors='ignore').rstrip('\r') for l in linhas)
+  if resto:
+   with job['log_lock']:
+    job['log'].append(resto.decode('utf-8', errors='ignore'))
+  job['returncode'] = await proc.wait()
+
+def start_sim_job(cmd, cwd, out_log, err_log):
+ """Inicia o simulador numa thread com seu próprio loop asyncio.
+ A thread fica em `await proc.wait()` e ao terminar marca job['done']; o painel
+ sim_status_panel verifica esse evento sem bloquear a thread do script."""
+ job = {'pid': None, 'returncode': None, 'error': None,
+  'started': threading.Event(), 'done': threading.Event(),
+  'log': deque(maxlen=LOG_BUFFER_LINES), 'log_lock': threading.Lock()}
+
+ def _worker():
+  try:
+   asyncio.run(_run_sim_process(job, cmd, cwd, out_log, err_log))
+  except Exception as e:
+   job['error'] = e
+  finally:
+   job['started'].set()
+   job['done'].set()
+
+ threading.Thread(target=_worker, daemon=True).start()
+ job['started'].wait()
+ if job['error'] is not None:
+  raise job['error']
+ return job
+
+def job_log_tail(job, n=LOG_TAIL_LINES):
+ """Últimas n linhas de stdout do simulador, direto da memória."""
+ with job['log_lock']:
+  linhas = list(job['log'])
+ return "\n".join(linhas[-n:])
+
+# st.fragment (experimental_fragment em versões anteriores) refaz só o painel, não a página
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+_rerun = getattr(st, 'rerun', None) or st.experimental_rerun
+
+def sim_status_panel():
+ """Status e log do simulador em execução. Com suporte a fragmentos, só este painel é
+ refeito a cada SIM_POLL_SECONDS; quando job['done'] é marcado a página inteira é refeita uma vez."""
+ job = st.session_state.get('sim_job')
+ if job is None:
+  return
+ if job['done'].is_set():
+  st.session_state['sim_status'] = 'finished'
+  st.session_state['sim_job'] = None
+  st.success(f'Simulação finalizada (código: {job["returncode"]}). Carregando resultados...')
+  _rerun() # carrega e mostra os resultados
+  return
+ elapsed = time.time() - st.session_state['sim_start_time']
+ st.info(f'Executando... Tempo: {elapsed:.0f}s. (A página é atualizada automaticamente ao terminar)')
+ with st.expander("Ver Logs da Simulação", expanded=False):
+  try:
+   st.text_area("Log (stdout):", job_log_tail(job), height=250)
+  except Exception as e:
+   st.warning(f"Não foi possível ler o log: {e}")
+ if _fragment is None:
+  # Streamlit sem fragmentos: atualização manual em vez de reruns periódicos
+  st.button('Atualizar status', key='sim_refresh')
+
+if _fragment is not None:
+ sim_status_panel = _fragment(run_every=SIM_POLL_SECONDS)(sim_status_panel)
+
 # --- Importações e Fallbacks (mantidos do código anterior) ---
 try:
  from PythonIA import psi, f_ia, rodar_simulacao, a, c, m
@@ -87,6 +412,13 @@ except Exception:
  psi, f_ia, rodar_simulacao = None, None, None
  a, c, m =1664525,1013904223,2**32
 
+@st.cache_data(show_spinner=False)
+def run_volterra_cached(n_dias, lambda_p, xi_p, a, c, m):
+ """rodar_simulacao com dt=1 como DataFrame; a saída só depende dos parâmetros,
+ então repetir a mesma simulação vem direto do cache."""
+ t, x, f, _, _ = rodar_simulacao(n_dias, 1, lambda_p, xi_p, a, c, m)
+ return pd.DataFrame({'Tempo (dias)': t, 'Estado (x_n)': x, 'Impacto (f_n)': f})
+
 sim_script_path = os.path.join(script_dir, 'simular_anticorpo.py')
 if not os.path.exists(sim_script_path):
  project_root = os.path.dirname(script_dir)
@@ -98,7 +430,7 @@ if not os.path.exists(sim_script_path):
 # --- Estado da Sessão (inicialização robusta) ---
 def _init_session():
  default_session_state = {
- 'sim_proc': None, 'sim_out': None, 'sim_err': None, 'sim_out_json': None,
+ 'sim_job': None, 'sim_out': None, 'sim_err': None, 'sim_out_json': None,
  'sim_start_time': None, 'sim_result': None, 'sim_status': 'idle',
  'volterra_results': None # Para guardar resultados da simulação Volterra
  }
@@ -143,7 +475,7 @@ with st.sidebar:
  st.success(f'Usando: {fasta_file.name}')
  elif fasta_option == f'Pasta "{os.path.basename(INPUT_FOLDER)}"':
  try:
- fasta_files = sorted([f for f in os.listdir(INPUT_FOLDER) if f.endswith(('.fasta', '.fa', '.fna'))])
+ fasta_files = _list_fastas(INPUT_FOLDER, os.stat(INPUT_FOLDER).st_mtime)
  if fasta_files:
  selected_fasta = st.selectbox("Selecione o arquivo:", options=fasta_files, key='fasta_select')
  fasta_filename_to_use = os.path.join(INPUT_FOLDER, selected_fasta)
@@ -163,8 +495,7 @@ with st.sidebar:
 if run_volterra:
  if rodar_simulacao:
  with st.spinner("Executando Simulação Volterra..."):
- t, x, f, m_hist = rodar_simulacao(n_dias,1, lambda_p, xi_p, a, c, m) # dt=1
- st.session_state['volterra_results'] = pd.DataFrame({'Tempo (dias)': t, 'Estado (x_n)': x, 'Impacto (f_n)': f})
+ st.session_state['volterra_results'] = run_volterra_cached(n_dias, lambda_p, xi_p, a, c, m) # dt=1
  st.experimental_rerun() # Recarrega para mostrar os resultados
  else:
  st.error("Função 'rodar_simulacao' não disponível.")
@@ -173,37 +504,7 @@ if st.session_state['volterra_results'] is not None:
  st.header(f"📈 Resultados Volterra (Semente {st.session_state.get('xi_p_last_run', xi_p)})") # Mostra a semente usada
  df_volterra = st.session_state['volterra_results']
 
- # Criar figura Plotly com dois eixos Y
- fig_volterra = go.Figure()
- # Linha para Estado (x_n) no eixo Y esquerdo
- fig_volterra.add_trace(go.Scatter(x=df_volterra['Tempo (dias)'], y=df_volterra['Estado (x_n)'],
- mode='lines', name='Estado (x_n)', yaxis='y1',
- line=dict(color=_color_estado)))
- # Barras para Impacto (f_n) no eixo Y direito
- fig_volterra.add_trace(go.Bar(x=df_volterra['Tempo (dias)'], y=df_volterra['Impacto (f_n)'],
- name='Impacto (f_n)', yaxis='y2',
- marker=dict(color=_color_impacto, opacity=0.6)))
-
- # Configurar layout com dois eixos Y
- fig_volterra.update_layout(
- title="Evolução Temporal: Estado vs. Impacto",
- xaxis_title="Tempo (dias)",
- yaxis=dict(
- title="Estado (x_n)",
- titlefont=dict(color="royalblue"),
- tickfont=dict(color="royalblue")
- ),
- yaxis2=dict(
- title="Impacto (f_n)",
- titlefont=dict(color="crimson"),
- tickfont=dict(color="crimson"),
- overlaying="y",
- side="right",
- showgrid=False # Não mostrar grid para o segundo eixo
- ),
- legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
- hovermode="x unified" # Mostra info de ambas as traces ao passar o mouse
- )
+ fig_volterra = build_volterra_fig(frame_key(df_volterra), df_volterra, _color_estado, _color_impacto)
  st.plotly_chart(fig_volterra, use_container_width=True)
 
  with st.expander("Ver Tabela de Dados Volterra (últimos10 dias)"):
@@ -222,28 +523,27 @@ if run_antibody_sim:
  out_log = os.path.join(OUTPUT_FOLDER, f'sim_ant_out_{uid}.log')
  err_log = os.path.join(OUTPUT_FOLDER, f'sim_ant_err_{uid}.log')
  out_json = os.path.join(OUTPUT_FOLDER, f'sim_ant_result_{uid}.json')
+ out_parquet = os.path.join(OUTPUT_FOLDER, f'sim_ant_hist_{uid}.parquet')
 
- cmd = [sys.executable, sim_script_path,
+ cmd = [sys.executable, '-u', sim_script_path, # -u: stdout sem buffer, linhas chegam ao pipe na hora
  '--model', model_path,
  '--n', str(int(n_mutacoes)),
  '--out-json', out_json]
+ if HAS_PYARROW: # sem pyarrow o histórico fica no próprio JSON
+ cmd += ['--out-parquet', out_parquet]
  if fasta_filename_to_use:
  cmd += ['--dna-file', fasta_filename_to_use]
 
  try:
- with open(out_log, 'w', encoding='utf-8') as out_f, \
- open(err_log, 'w', encoding='utf-8') as err_f:
- proc = subprocess.Popen(cmd, stdout=out_f, stderr=err_f,
- cwd=os.path.dirname(sim_script_path),
- universal_newlines=True)
- st.session_state['sim_proc'] = proc
+ job = start_sim_job(cmd, os.path.dirname(sim_script_path), out_log, err_log)
+ st.session_state['sim_job'] = job
  st.session_state['sim_out'] = out_log
  st.session_state['sim_err'] = err_log
  st.session_state['sim_out_json'] = out_json
  st.session_state['sim_start_time'] = time.time()
  st.session_state['sim_status'] = 'running'
  st.session_state['sim_result'] = None
- st.success(f'Simulação de anticorpo iniciada (PID {proc.pid}). Logs em: {OUTPUT_FOLDER}')
+ st.success(f'Simulação de anticorpo iniciada (PID {job["pid"]}). Logs em: {OUTPUT_FOLDER}')
  st.experimental_rerun()
  except Exception as e:
  st.error(f'Falha ao iniciar simulação de anticorpo: {e}')
@@ -251,32 +551,10 @@ if run_antibody_sim:
 # Monitoramento e exibição de resultados do subprocesso (IA)
 st.header("🔬 Resultados da Engenharia de Anticorpo")
 status_placeholder_ia = st.empty()
-log_expander = st.expander("Ver Logs da Simulação", expanded=False)
 
 if st.session_state['sim_status'] == 'running':
- proc = st.session_state.get('sim_proc')
- if proc:
- poll_result = proc.poll()
- if poll_result is None:
- elapsed = time.time() - st.session_state['sim_start_time']
- status_placeholder_ia.info(f'Executando... Tempo: {elapsed:.0f}s. (Clique em "Ver Status" na barra lateral para atualizar)')
- # Mostrar log dentro do expander
- try:
- if st.session_state['sim_out'] and os.path.exists(st.session_state['sim_out']):
- with open(st.session_state['sim_out'], 'r', encoding='utf-8', errors='ignore') as f:
- lines = f.readlines()
- with log_expander:
- st.text_area("Log (stdout):", "".join(lines[-20:]), height=250, key='log_area_run')
- except Exception as e:
- with log_expander: st.warning(f"Não foi possível ler o log: {e}")
- # Rerun periódico pode ser irritante, remover ou espaçar mais
- # time.sleep(5)
- # st.experimental_rerun()
- else: # Processo terminou
- st.session_state['sim_status'] = 'finished'
- st.session_state['sim_proc'] = None
- status_placeholder_ia.success(f'Simulação finalizada (código: {poll_result}). Carregando resultados...')
- st.experimental_rerun() # Força rerun para carregar e mostrar resultados
+ # só o painel de status/log é refeito enquanto roda; a página é refeita ao terminar
+ sim_status_panel()
 
 elif st.session_state['sim_status'] in ('finished', 'cancelled', 'error'):
  if st.session_state['sim_status'] == 'cancelled': status_placeholder_ia.warning("Simulação foi cancelada.")
@@ -287,8 +565,7 @@ elif st.session_state['sim_status'] in ('finished', 'cancelled', 'error'):
  # Tenta carregar o resultado do JSON se ainda não estiver na sessão
  if not st.session_state.get('sim_result') and out_json_path and os.path.exists(out_json_path):
  try:
- with open(out_json_path, 'r', encoding='utf-8') as jf:
- st.session_state['sim_result'] = json.load(jf)
+ st.session_state['sim_result'] = read_json(out_json_path)
  status_placeholder_ia.success(f"Resultados carregados de: {os.path.basename(out_json_path)}")
  except Exception as e:
  status_placeholder_ia.error(f'Falha ao ler JSON ({os.path.basename(out_json_path)}): {e}')
@@ -317,27 +594,19 @@ elif st.session_state['sim_status'] in ('finished', 'cancelled', 'error'):
 
  # Análise Interativa do Histórico
  st.subheader("📈 Análise Interativa do Histórico")
- history = parsed.get('history', [])
- if history:
- df_hist = pd.DataFrame(history)
- try:
+ # dna não é exibido: lê só as colunas usadas nos gráficos e na tabela
+ df_hist = load_history(parsed, columns=('i', 'impacto', 'prot'))
  if not df_hist.empty:
- df_hist['impacto'] = pd.to_numeric(df_hist['impacto'], errors='coerce').fillna(0)
- df_hist['i'] = pd.to_numeric(df_hist['i'], errors='coerce').fillna(0)
- df_hist['prot_len'] = df_hist['prot'].apply(lambda x: len(x) if isinstance(x, str) else0)
+ try:
+ df_hist['impacto'] = pd.to_numeric(df_hist['impacto'], errors='coerce').fillna(0).astype(np.float32)
+ df_hist['i'] = pd.to_numeric(df_hist['i'], errors='coerce').fillna(0).astype(np.int32)
+ # sequências em buffer Arrow contíguo em vez de um objeto str Python por linha
+ df_hist['prot'] = df_hist['prot'].astype(PROT_DTYPE)
+ df_hist['prot_len'] = df_hist['prot'].str.len().fillna(0).astype(np.int32)
 
  #1. Gráfico de Impacto vs Iteração com Melhor Cumulativo
- df_hist['melhor_impacto_acumulado'] = df_hist['impacto'].cummax()
- fig_progress = go.Figure()
- fig_progress.add_trace(go.Scatter(x=df_hist['i'], y=df_hist['impacto'], mode='markers', name='Impacto da Iteração',
- marker=dict(color='lightblue', size=5, opacity=0.7),
- customdata=df_hist[['prot', 'dna']],
- hovertemplate="Iter: %{x}<br>Impacto: %{y:.4f}<br>Prot: %{customdata[0]}<extra></extra>"))
- fig_progress.add_trace(go.Scatter(x=df_hist['i'], y=df_hist['melhor_impacto_acumulado'], mode='lines', name='Melhor Impacto Acumulado',
- line=dict(color=_color_progress, width=2)))
- fig_progress.update_layout(title="Progresso da Otimização: Impacto vs Iteração",
- xaxis_title="Iteração (i)", yaxis_title="Impacto Previsto (f)",
- hovermode="closest")
+ df_hist['melhor_impacto_acumulado'] = np.maximum.accumulate(df_hist['impacto'].to_numpy())
+ fig_progress = build_progress_fig(frame_key(df_hist), df_hist, _color_progress)
  st.plotly_chart(fig_progress, use_container_width=True)
 
  #2. Histograma e Top N (com filtro)
@@ -346,21 +615,23 @@ elif st.session_state['sim_status'] in ('finished', 'cancelled', 'error'):
  default_thresh_hist = max(min_imp_hist, max_imp_hist *0.1) if max_imp_hist > min_imp_hist else min_imp_hist
  threshold_hist = st.slider('Filtrar Histograma/Tabela por Impacto Mínimo', min_imp_hist, max_imp_hist, default_thresh_hist, key='hist_slider')
 
- df_filtered_hist = df_hist[df_hist['impacto'] >= threshold_hist].copy()
+ df_filtered_hist = df_hist[df_hist['impacto'] >= threshold_hist]
 
  if not df_filtered_hist.empty:
- # Adiciona detalhes da mutação e aminoácidos
  orig_prot_hist = parsed.get('original_protein')
- df_filtered_hist['mutacao_detalhe'] = df_filtered_hist.apply(lambda row: find_mutation_details(orig_prot_hist, row['prot']), axis=1)
 
  col_hist, col_top = st.columns(2)
  with col_hist:
- fig_hist_dist = px.histogram(df_filtered_hist, x='impacto', nbins=30, title='Distribuição dos Impactos Filtrados', color_discrete_sequence=[_color_progress])
+ # contagens calculadas aqui: o navegador recebe 30 barras, não todos os impactos
+ counts, edges = histogram_counts(df_filtered_hist['impacto'].to_numpy(), 30)
+ fig_hist_dist = build_hist_fig(counts, edges, _color_progress)
  st.plotly_chart(fig_hist_dist, use_container_width=True)
  
  with col_top:
  top_n_hist = st.number_input('Mostrar top N mutações (filtradas)', min_value=1, max_value=len(df_filtered_hist), value=min(10, len(df_filtered_hist)), key='hist_topn')
- top_df_hist = df_filtered_hist.sort_values('impacto', ascending=False).head(int(top_n_hist))
+ top_df_hist = df_filtered_hist.nlargest(int(top_n_hist), 'impacto').reset_index(drop=True)
+ # Adiciona detalhes da mutação só às linhas exibidas (top N), não a todo o histórico filtrado
+ top_df_hist['mutacao_detalhe'] = find_mutation_details_vec(orig_prot_hist, top_df_hist['prot'])
  st.markdown(f'**Top {int(top_n_hist)} Mutações (Impacto >= {threshold_hist:.3f})**')
  # Selecionar e renomear colunas para a tabela
  st.dataframe(top_df_hist[['i', 'prot', 'impacto', 'mutacao_detalhe']].rename(columns={'i': 'Iter', 'prot': 'Proteína', 'impacto': 'Impacto', 'mutacao_detalhe': 'Mutação'}).reset_index(drop=True))
@@ -389,9 +660,9 @@ elif st.session_state['sim_status'] in ('finished', 'cancelled', 'error'):
  st.write(get_aa_info(aa_mut))
  # simple interpretation
  interp = []
- if 'Carregado' in AMINO_ACID_INFO.get(aa_orig, {}).get('prop', '') and 'Carregado' not in AMINO_ACID_INFO.get(aa_mut, {}).get('prop', ''):
+ if 'Carregado' in PROP_TABLE[_aa_index(aa_orig)] and 'Carregado' not in PROP_TABLE[_aa_index(aa_mut)]:
  interp.append('Perda de carga pode reduzir interações eletrostáticas')
- if 'hidrofóbico' in AMINO_ACID_INFO.get(aa_mut, {}).get('prop', '').lower():
+ if 'hidrofóbico' in PROP_TABLE[_aa_index(aa_mut)].lower():
  interp.append('Aumento de hidrofobicidade pode afetar dobra local')
  if interp:
  st.info(' | '.join(interp))
@@ -401,7 +672,8 @@ elif st.session_state['sim_status'] in ('finished', 'cancelled', 'error'):
 # Add configuration persistence and UI color settings
 CONFIG_PATH = os.path.join(script_dir, 'dashboard_config.json')
 
-def load_config():
+@st.cache_data(show_spinner=False)
+def _load_config_cached(mtime):
  default = {
  'model_path': 'modelo_anticorpo_corretivo.keras',
  'n_mutacoes':500,
@@ -411,17 +683,20 @@ def load_config():
  }
  try:
  if os.path.exists(CONFIG_PATH):
- with open(CONFIG_PATH, 'r', encoding='utf-8') as cf:
- data = json.load(cf)
+ data = read_json(CONFIG_PATH)
  default.update(data)
  except Exception:
  pass
  return default
 
+def load_config():
+ # mtime como chave: salvar as preferências muda o mtime e invalida o cache
+ mtime = os.path.getmtime(CONFIG_PATH) if os.path.exists(CONFIG_PATH) else 0
+ return _load_config_cached(mtime)
+
 def save_config(cfg):
  try:
- with open(CONFIG_PATH, 'w', encoding='utf-8') as cf:
- json.dump(cfg, cf, ensure_ascii=False, indent=2)
+ write_json(cfg, CONFIG_PATH)
  return True
  except Exception:
  return False
@@ -457,23 +732,31 @@ _color_impacto = color_impacto if 'color_impacto' in locals() else config.get('c
 _color_progress = color_progress if 'color_progress' in locals() else config.get('color_progress', '#FF4136')
 
 # --- Helpers: list, delete, thumbnail generation for past runs ---
-def list_result_jsons(outdir=OUTPUT_FOLDER):
+@st.cache_data(ttl=30, show_spinner=False)
+def _list_result_jsons_cached(outdir, mtime):
+ # os.scandir: nome e stat de cada entrada sem um getmtime (stat) extra por arquivo
  files = []
  try:
- for fn in sorted(os.listdir(outdir), reverse=True):
- if fn.endswith('.json') and fn.startswith('sim_ant_result_'):
- path = os.path.join(outdir, fn)
- try:
- mtime = os.path.getmtime(path)
- except Exception:
- mtime =0
- files.append({'name': fn, 'path': path, 'mtime': mtime})
- except Exception:
- pass
- files.sort(key=lambda x: x['mtime'], reverse=True)
+  with os.scandir(outdir) as it:
+   for e in it:
+    if e.name.startswith('sim_ant_result_') and e.name.endswith('.json'):
+     try:
+      file_mtime = e.stat().st_mtime
+     except OSError:
+      file_mtime = 0
+     files.append({'name': e.name, 'path': e.path, 'mtime': file_mtime})
+ except OSError:
+  pass
+ # mais recente primeiro; empate pelo nome, também decrescente
+ files.sort(key=lambda x: (x['mtime'], x['name']), reverse=True)
  return files
 
 
+def list_result_jsons(outdir=OUTPUT_FOLDER):
+ # the folder mtime changes when a run is added/removed, so it works as cache key
+ return _list_result_jsons_cached(outdir, _folder_mtime(outdir))
+
+
 def uid_from_result_name(name):
  # expected name like sim_ant_result_<uid>.json
  base = os.path.basename(name)
@@ -482,40 +765,78 @@ def uid_from_result_name(name):
  return None
 
 
+def _thumb_path(json_path, outdir=OUTPUT_FOLDER):
+ base = os.path.basename(json_path).replace('.json', '.png')
+ return os.path.join(outdir, 'thumbnails', f"thumb_{base}")
+
+
+def _thumbnail_job(json_path, outdir=OUTPUT_FOLDER):
+ """(impacts, thumb_path) for a run, or None when it has no history."""
+ data = read_json(json_path)
+ df_hist = load_history(data, columns=('impacto', 'impact'))
+ if df_hist.empty:
+  return None
+ col = 'impacto' if 'impacto' in df_hist else 'impact'
+ impacts = pd.to_numeric(df_hist[col], errors='coerce').fillna(0).to_numpy()
+ if impacts.size == 0:
+  return None
+ os.makedirs(os.path.join(outdir, 'thumbnails'), exist_ok=True)
+ return impacts, _thumb_path(json_path, outdir)
+
+
+@st.cache_data(show_spinner=False)
+def _thumbnail_cached(json_path, mtime, outdir):
+ from miniaturas import desenhar_miniatura # matplotlib só é carregado aqui
+ job = _thumbnail_job(json_path, outdir)
+ return desenhar_miniatura(*job) if job is not None else None
+
+
 def generate_thumbnail_for_result(json_path, outdir=OUTPUT_FOLDER):
  """Generate a small PNG thumbnail summarizing the result (histogram of impacts).
+ Cached on (path, mtime), so asking again for an unchanged run costs nothing.
  Returns thumbnail path or None.
  """
  try:
- with open(json_path, 'r', encoding='utf-8') as jf:
- data = json.load(jf)
- history = data.get('history', [])
- if not history:
- return None
- impacts = [float(h.get('impacto', h.get('impact',0))) for h in history]
- if not impacts:
- return None
- # create thumbnails dir
- thumbs_dir = os.path.join(outdir, 'thumbnails')
- os.makedirs(thumbs_dir, exist_ok=True)
- base = os.path.basename(json_path).replace('.json', '.png')
- thumb_path = os.path.join(thumbs_dir, f"thumb_{base}")
- # small matplotlib figure
- import matplotlib
- matplotlib.use('Agg')
- import matplotlib.pyplot as plt
- fig = plt.figure(figsize=(2.5,1.5), dpi=100)
- ax = fig.add_subplot(111)
- ax.hist(impacts, bins=10, color='#4C72B0')
- ax.set_xticks([])
- ax.set_yticks([])
- ax.set_title('Impacts', fontsize=8)
- fig.tight_layout()
- fig.savefig(thumb_path, bbox_inches='tight')
- plt.close(fig)
- return thumb_path
+  thumb = _thumbnail_cached(json_path, os.path.getmtime(json_path), outdir)
+  if thumb and not os.path.exists(thumb):
+   from miniaturas import desenhar_miniatura
+   # removed from disk since it was cached: draw it again
+   job = _thumbnail_job(json_path, outdir)
+   thumb = desenhar_miniatura(*job) if job is not None else None
+  return thumb
  except Exception:
- return None
+  return None
+
+
+def generate_thumbnails(runs, outdir=OUTPUT_FOLDER):
+ """Thumbnails for several runs, drawn in parallel by a process pool.
+ Runs whose thumbnail is already newer than the JSON are skipped.
+ Returns (created, skipped): thumbnails drawn now and runs already up to date.
+ """
+ created = skipped = 0
+ jobs = []
+ for r in runs:
+  thumb = _thumb_path(r['path'], outdir)
+  if os.path.exists(thumb) and os.path.getmtime(thumb) >= r['mtime']:
+   skipped += 1
+   continue
+  try:
+   job = _thumbnail_job(r['path'], outdir)
+  except Exception:
+   job = None
+  if job is not None:
+   jobs.append(job)
+ if jobs:
+  from miniaturas import desenhar_miniatura
+  with ProcessPoolExecutor() as ex:
+   futures = [ex.submit(desenhar_miniatura, impacts, thumb) for impacts, thumb in jobs]
+   for fut in futures:
+    try:
+     fut.result()
+     created += 1
+    except Exception:
+     pass
+ return created, skipped
 
 
 def delete_run_and_artifacts(json_info):
@@ -532,7 +853,8 @@ def delete_run_and_artifacts(json_info):
  # delete logs
  out_log = os.path.join(OUTPUT_FOLDER, f'sim_ant_out_{uid}.log')
  err_log = os.path.join(OUTPUT_FOLDER, f'sim_ant_err_{uid}.log')
- for p in (out_log, err_log):
+ hist_parquet = os.path.join(OUTPUT_FOLDER, f'sim_ant_hist_{uid}.parquet')
+ for p in (out_log, err_log, hist_parquet):
  try:
  if os.path.exists(p):
  os.remove(p)
@@ -557,8 +879,7 @@ if available_runs:
  selected_run = available_runs[selected_idx]
  if st.sidebar.button('Carregar execução selecionada'):
  try:
- with open(selected_run['path'], 'r', encoding='utf-8') as jf:
- st.session_state['sim_result'] = json.load(jf)
+ st.session_state['sim_result'] = read_json(selected_run['path'])
  st.session_state['sim_out_json'] = selected_run['path']
  st.session_state['sim_status'] = 'finished'
  st.success(f'Execução {selected_run["name"]} carregada')
@@ -588,11 +909,8 @@ if available_runs:
  st.sidebar.warning('Não foi possível criar miniatura para esta execução.')
 
  if st.sidebar.button('Gerar miniaturas para todas as execuções'):
- created =0
- for r in available_runs:
- if generate_thumbnail_for_result(r['path']):
- created +=1
- st.sidebar.success(f'{created} miniaturas criadas.')
+ created, skipped = generate_thumbnails(available_runs)
+ st.sidebar.success(f'{created} miniaturas criadas, {skipped} já estavam atualizadas.')
 
 else:
  st.sidebar.info('Nenhuma execução anterior encontrada em OUTPUT_FOLDER.')
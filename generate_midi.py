@@ -1,8 +1,40 @@
-from mido import Message, MidiFile, MidiTrack, MetaMessage, bpm2tempo
+from mido import Message, MetaMessage, MidiFile, bpm2tempo
 import argparse
 import os
 import subprocess
 import io
+import struct
+import queue
+import threading
+import wave
+import numpy as np
+
+# pyfluidsynth is optional: used to render many MIDIs with one loaded SoundFont
+try:
+    import fluidsynth
+    HAS_FLUIDSYNTH = True
+except Exception:
+    HAS_FLUIDSYNTH = False
+
+
+def _note_events(notes):
+    """Struct-of-arrays view of notes: event 2k is the note_on of note k, event 2k+1 its note_off.
+
+    Returns (order, deltas, pitches, vels): order lists the event indices sorted by
+    absolute time, stable so note_on before note_off at same time, and deltas[i] is
+    the delta time of event order[i] (delta encoding of the sorted times, >= 0).
+    """
+    notes = list(notes)
+    pitches = [int(n['note']) for n in notes]
+    vels = [int(n.get('velocity', 64)) for n in notes]
+    times = np.empty(2 * len(notes), dtype=np.int64)
+    times[0::2] = [int(n['start']) for n in notes]
+    times[1::2] = [int(n['start'] + n['duration']) for n in notes]
+    order = np.argsort(times, kind='stable')
+    deltas = np.diff(times[order], prepend=0)
+    # only the first delta can be negative (event before tick 0)
+    np.maximum(deltas, 0, out=deltas)
+    return order.tolist(), deltas.tolist(), pitches, vels
 
 
 def write_track_from_notes(track, notes, channel=0, program=None, track_name=None):
@@ -19,48 +51,87 @@ def write_track_from_notes(track, notes, channel=0, program=None, track_name=Non
     if program is not None:
         track.append(Message('program_change', program=program, time=0, channel=channel))
 
-    events = []  # list of (abs_time, Message)
-    for n in notes:
-        vel = n.get('velocity', 64)
-        start = int(n['start'])
-        end = int(n['start'] + n['duration'])
-        events.append((start, Message('note_on', note=int(n['note']), velocity=vel, time=0, channel=channel)))
-        events.append((end, Message('note_off', note=int(n['note']), velocity=vel, time=0, channel=channel)))
+    order, deltas, pitches, vels = _note_events(notes)
+
+    for k, delta in zip(order, deltas):
+        kind = 'note_off' if k & 1 else 'note_on'
+        track.append(Message(kind, note=pitches[k >> 1], velocity=vels[k >> 1], time=delta, channel=channel))
+
+
+def encode_vlq(value, buf):
+    """Append value to buf as a MIDI variable-length quantity (7-bit groups, high bit = more follow)."""
+    if value < 0x80:
+        buf.append(value)
+        return
+    groups = [value & 0x7f]
+    value >>= 7
+    while value:
+        groups.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buf.extend(reversed(groups))
+
+
+def _meta_event(msg, buf):
+    encode_vlq(msg.time, buf)
+    buf.extend(msg.bytes())
+
 
-    # sort by absolute time, stable so note_on before note_off at same time if created that way
-    events.sort(key=lambda x: x[0])
+def encode_track_from_notes(notes, channel=0, program=None, track_name=None):
+    """Same events as write_track_from_notes, serialized straight into MTrk bytes.
 
-    last_time = 0
-    for abs_time, msg in events:
-        delta = abs_time - last_time
-        if delta < 0:
-            delta = 0
-        msg.time = delta
-        track.append(msg)
-        last_time = abs_time
+    No mido.Message is built per note: each event is written as delta (VLQ),
+    status (omitted when equal to the previous one, running status) and two
+    data bytes. The closing end_of_track is included, as mido adds on save.
+    """
+    if not 0 <= channel <= 15:
+        raise ValueError('channel must be in range 0..15')
+    buf = bytearray()
+    running = None
+    if track_name:
+        _meta_event(MetaMessage('track_name', name=track_name, time=0), buf)
+
+    if program is not None:
+        if not 0 <= program <= 127:
+            raise ValueError('program must be in range 0..127')
+        running = 0xC0 | channel
+        buf.extend((0, running, program))
+
+    order, deltas, pitches, vels = _note_events(notes)
+    if any(not 0 <= v <= 127 for v in pitches) or any(not 0 <= v <= 127 for v in vels):
+        raise ValueError('note and velocity must be in range 0..127')
+
+    for k, delta in zip(order, deltas):
+        encode_vlq(delta, buf)
+        status = (0x80 if k & 1 else 0x90) | channel
+        if status != running:
+            buf.append(status)
+            running = status
+        buf.append(pitches[k >> 1])
+        buf.append(vels[k >> 1])
+
+    _meta_event(MetaMessage('end_of_track', time=0), buf)
+    return bytes(buf)
+
+
+def save_midi_tracks(outname, tracks, ticks_per_beat=480):
+    """Write a type 1 MIDI file from already encoded MTrk payloads (MThd + one MTrk chunk each)."""
+    with open(outname, 'wb') as fh:
+        fh.write(b'MThd' + struct.pack('>Lhhh', 6, 1, len(tracks), ticks_per_beat))
+        for data in tracks:
+            fh.write(b'MTrk' + struct.pack('>L', len(data)))
+            fh.write(data)
+    return outname
 
 
 def generate_example_midi(outname='output.mid', bpm=120, ticks_per_beat=480):
     """Generate a simple multi-track MIDI and save to outname.
     Returns the path to the saved MIDI file.
     """
-    mid = MidiFile(type=1, ticks_per_beat=ticks_per_beat)
-
     # Tempo track (track 0)
-    tempo_track = MidiTrack()
-    tempo_track.append(MetaMessage('track_name', name='Tempo', time=0))
-    tempo_track.append(MetaMessage('set_tempo', tempo=bpm2tempo(bpm), time=0))
-    mid.tracks.append(tempo_track)
-
-    # Create instrument tracks
-    piano = MidiTrack()
-    strings = MidiTrack()
-    choir = MidiTrack()
-    guitar = MidiTrack()
-    bass = MidiTrack()
-    drums = MidiTrack()
-
-    mid.tracks.extend([piano, strings, choir, guitar, bass, drums])
+    tempo_track = bytearray()
+    _meta_event(MetaMessage('track_name', name='Tempo', time=0), tempo_track)
+    _meta_event(MetaMessage('set_tempo', tempo=bpm2tempo(bpm), time=0), tempo_track)
+    _meta_event(MetaMessage('end_of_track', time=0), tempo_track)
 
     # Define notes as absolute times (ticks)
     piano_notes = [
@@ -91,16 +162,18 @@ def generate_example_midi(outname='output.mid', bpm=120, ticks_per_beat=480):
         {'note': 42, 'start': 120, 'duration': 120, 'velocity': 80},  # Hi-hat
     ]
 
-    # Write tracks
-    write_track_from_notes(piano, piano_notes, channel=0, program=0, track_name='Piano')
-    write_track_from_notes(strings, strings_notes, channel=1, program=48, track_name='Strings')
-    write_track_from_notes(choir, choir_notes, channel=2, program=52, track_name='Choir')
-    write_track_from_notes(guitar, guitar_notes, channel=3, program=24, track_name='Guitar')
-    write_track_from_notes(bass, bass_notes, channel=4, program=32, track_name='Bass')
-    write_track_from_notes(drums, drums_notes, channel=9, program=None, track_name='Drums')
+    # Encode instrument tracks straight to bytes
+    tracks = [
+        bytes(tempo_track),
+        encode_track_from_notes(piano_notes, channel=0, program=0, track_name='Piano'),
+        encode_track_from_notes(strings_notes, channel=1, program=48, track_name='Strings'),
+        encode_track_from_notes(choir_notes, channel=2, program=52, track_name='Choir'),
+        encode_track_from_notes(guitar_notes, channel=3, program=24, track_name='Guitar'),
+        encode_track_from_notes(bass_notes, channel=4, program=32, track_name='Bass'),
+        encode_track_from_notes(drums_notes, channel=9, program=None, track_name='Drums'),
+    ]
 
-    mid.save(outname)
-    return outname
+    return save_midi_tracks(outname, tracks, ticks_per_beat=ticks_per_beat)
 
 
 def render_wav_with_fluidsynth(midfile, soundfont, outwav, sample_rate=44100):
@@ -125,13 +198,133 @@ def render_wav_with_fluidsynth(midfile, soundfont, outwav, sample_rate=44100):
     return outwav
 
 
+def _write_wav(outwav, pcm, sample_rate):
+    """Write interleaved int16 stereo frames (shape (n, 2)) as a PCM WAV file."""
+    with wave.open(outwav, 'wb') as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(np.ascontiguousarray(pcm, dtype='<i2').tobytes())
+
+
+class FluidSynthRenderer:
+    """In-process FluidSynth synth that loads the SoundFont once and renders many MIDIs.
+
+    Requires pyfluidsynth (`import fluidsynth`). Use render() to get the PCM
+    buffer, render_to_wav() for one file, or render_many() for a batch.
+    """
+
+    def __init__(self, soundfont, sample_rate=44100, tail_seconds=1.0):
+        if not HAS_FLUIDSYNTH:
+            raise RuntimeError('pyfluidsynth not available. Install it or use render_wav_with_fluidsynth.')
+        if not os.path.isfile(soundfont):
+            raise FileNotFoundError(f'SoundFont .sf2 not found: {soundfont}')
+        self.sample_rate = sample_rate
+        self.tail_seconds = tail_seconds
+        self.synth = fluidsynth.Synth(samplerate=float(sample_rate))
+        self.sfid = self.synth.sfload(soundfont)
+        for ch in range(16):
+            self.synth.program_select(ch, self.sfid, 128 if ch == 9 else 0, 0)
+
+    def close(self):
+        if self.synth is not None:
+            self.synth.delete()
+            self.synth = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _reset(self):
+        for ch in range(16):
+            self.synth.cc(ch, 123, 0)  # all notes off
+            self.synth.cc(ch, 121, 0)  # reset controllers
+            self.synth.program_select(ch, self.sfid, 128 if ch == 9 else 0, 0)
+
+    def render(self, midfile):
+        """Render a MIDI file; returns int16 stereo frames as an array of shape (n, 2)."""
+        if not os.path.isfile(midfile):
+            raise FileNotFoundError(f'MIDI file not found: {midfile}')
+        fs = self.synth
+        self._reset()
+        chunks = []
+        t_abs = 0.0
+        frames_done = 0
+        # MidiFile iteration yields messages with delta times in seconds (tempo applied)
+        for msg in MidiFile(midfile):
+            t_abs += msg.time
+            target = int(round(t_abs * self.sample_rate))
+            if target > frames_done:
+                chunks.append(fs.get_samples(target - frames_done))
+                frames_done = target
+            if msg.type == 'note_on':
+                fs.noteon(msg.channel, msg.note, msg.velocity)
+            elif msg.type == 'note_off':
+                fs.noteoff(msg.channel, msg.note)
+            elif msg.type == 'program_change':
+                fs.program_change(msg.channel, msg.program)
+            elif msg.type == 'control_change':
+                fs.cc(msg.channel, msg.control, msg.value)
+            elif msg.type == 'pitchwheel':
+                fs.pitch_bend(msg.channel, msg.pitch)
+        tail = int(round(self.tail_seconds * self.sample_rate))
+        if tail > 0:
+            chunks.append(fs.get_samples(tail))
+        if not chunks:
+            return np.zeros((0, 2), dtype=np.int16)
+        return np.concatenate(chunks).astype(np.int16, copy=False).reshape(-1, 2)
+
+    def render_to_wav(self, midfile, outwav):
+        _write_wav(outwav, self.render(midfile), self.sample_rate)
+        return outwav
+
+    def render_many(self, jobs):
+        """Render (midfile, outwav) pairs; WAVs are written by a background thread
+        (bounded queue) while the synth renders the next MIDI. Returns the WAV paths.
+        """
+        q = queue.Queue(maxsize=2)
+        errors = []
+
+        def writer():
+            while True:
+                item = q.get()
+                if item is None:
+                    return
+                outwav, pcm = item
+                try:
+                    _write_wav(outwav, pcm, self.sample_rate)
+                except Exception as e:
+                    errors.append(e)
+
+        th = threading.Thread(target=writer, daemon=True)
+        th.start()
+        outs = []
+        try:
+            for midfile, outwav in jobs:
+                q.put((outwav, self.render(midfile)))
+                outs.append(outwav)
+        finally:
+            q.put(None)
+            th.join()
+        if errors:
+            raise errors[0]
+        return outs
+
+
 def parse_args_and_run():
     parser = argparse.ArgumentParser(description='Generate example MIDI and optionally render to WAV with fluidsynth')
     parser.add_argument('--tempo', type=int, default=120, help='Tempo in BPM')
     parser.add_argument('--out', type=str, default='Antena_do_Seculo_Vindouro_Marilia_fixed.mid', help='Output MIDI filename')
     parser.add_argument('--wav', type=str, default=None, help='If provided, path to output WAV file (requires --soundfont)')
     parser.add_argument('--soundfont', type=str, default=None, help='Path to .sf2 SoundFont used by fluidsynth')
+    parser.add_argument('--render-wav', nargs='+', default=None, metavar='MIDI',
+                        help='Render these MIDI files to WAV (same name, .wav) with one in-process synth; '
+                             'requires pyfluidsynth and --soundfont')
     args = parser.parse_args()
+    if args.render_wav and not args.soundfont:
+        parser.error('--render-wav requires --soundfont to be provided')
 
     midpath = generate_example_midi(outname=args.out, bpm=args.tempo)
     print(f'MIDI salvo: {midpath}')
@@ -142,6 +335,13 @@ def parse_args_and_run():
         wavpath = render_wav_with_fluidsynth(midpath, args.soundfont, args.wav)
         print(f'WAV renderizado: {wavpath}')
 
+    if args.render_wav:
+        # the SoundFont is loaded once for the whole batch
+        jobs = [(mid, os.path.splitext(mid)[0] + '.wav') for mid in args.render_wav]
+        with FluidSynthRenderer(args.soundfont) as renderer:
+            for wavpath in renderer.render_many(jobs):
+                print(f'WAV renderizado: {wavpath}')
+
 
 if __name__ == '__main__':
     parse_args_and_run()
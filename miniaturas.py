@@ -0,0 +1,22 @@
+# MIT License (c)2025 Andre Galberto - see LICENSE.md for full text
+"""
+Thumbnail PNGs (histogram of impacts) for past antibody-simulation runs.
+Kept in its own module so the dashboard can hand desenhar_miniatura to a
+ProcessPoolExecutor (functions defined inside the Streamlit script cannot be pickled).
+"""
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+def desenhar_miniatura(impacts, thumb_path):
+    """Draw the impacts histogram into thumb_path and return the path."""
+    fig = Figure(figsize=(2.5, 1.5), dpi=100)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax.hist(impacts, bins=10, color='#4C72B0')
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.set_title('Impacts', fontsize=8)
+    fig.tight_layout()
+    fig.savefig(thumb_path, bbox_inches='tight')
+    return thumb_path
@@ -17,7 +17,10 @@ PythonIA/pdbs/ and print instructions for opening the visualization in a noteboo
 import argparse
 import os
 import sys
+import shutil
+from pathlib import Path
 from pprint import pprint
+import threading
 import webbrowser
 
 # import simulation functions
@@ -32,7 +35,54 @@ except Exception:
     run_simulation_with_detection = mod.run_simulation_with_detection
 
 
-def try_visualize_event(pdb_id='2OCJ', chain='A', resi=248, mutation='R248W'):
+def _open_in_browser(path):
+    """Open a local file in the browser without blocking the caller.
+
+    webbrowser.open may spawn a browser process, so it runs on a separate
+    thread; the thread is not a daemon so a CLI run still waits for the
+    launch at interpreter exit instead of dropping it.
+    """
+    url = 'file://' + os.path.abspath(path)
+
+    def _open():
+        try:
+            webbrowser.open(url)
+        except Exception:
+            pass
+
+    threading.Thread(target=_open, name='open-browser').start()
+
+
+# Standalone 3Dmol page written around the raw PDB text: _HTML_PRE, PDB, _HTML_POST
+_HTML_PRE = """<!doctype html>
+<html>
+<head>
+ <meta charset='utf-8'/>
+ <title>3D View - {safe_id} res {resi}</title>
+ <script src='https://3dmol.csb.pitt.edu/build/3Dmol-min.js'></script>
+ <style>body {{ margin:0; padding:0; }} #viewer {{ width:100%; height:100vh; }}</style>
+</head>
+<body>
+ <div id='viewer'></div>
+ <script type='text/plain' id='pdb-data'>"""
+
+_HTML_POST = """</script>
+ <script>
+ var pdbData = document.getElementById('pdb-data').textContent;
+ var viewer = $3Dmol.createViewer('viewer', {{backgroundColor: 'white'}});
+ viewer.addModel(pdbData, 'pdb');
+ viewer.setStyle({{}}, {{cartoon: {{color: 'spectrum'}}}});
+ try {{
+ viewer.addStyle({{chain: '{chain}', resi: {resi}}}, {{stick: {{colorscheme: 'magentaCarbon'}}, sphere: {{radius:1.0, color:'magenta'}}}});
+ viewer.zoomTo({{chain: '{chain}', resi: {resi}}});
+ }} catch(e) {{}}
+ viewer.render();
+ </script>
+</body>
+</html>"""
+
+
+def try_visualize_event(pdb_id='2OCJ', chain='A', resi=248, mutation='R248W', open_in_browser=True):
     """Try to import visualize_p53_r248w and display or save PDB.
     Returns a dict with keys: 'view_available' (bool), 'saved_pdb' (path or None), 'html' (path or None).
     """
@@ -66,54 +116,34 @@ def try_visualize_event(pdb_id='2OCJ', chain='A', resi=248, mutation='R248W'):
             result['saved_pdb'] = saved_path
             # generate standalone HTML using export_html_view if available
             try:
-                with open(saved_path, 'r', encoding='utf-8') as fh:
-                    pdb_text = fh.read()
                 if export_html_view is not None:
-                    html_path = export_html_view(pdb_id, pdb_text, chain=chain, resi=resi, mutation=mutation)
+                    # one read + one decode; no text-mode reader copy
+                    pdb_text = Path(saved_path).read_bytes().decode('utf-8')
+                    html_path = export_html_view(pdb_id, pdb_text, chain=chain, resi=resi, mutation=mutation,
+                                                 open_in_browser=open_in_browser)
                     result['html'] = html_path
                 else:
                     # fallback: create a standalone HTML using 3Dmol CDN embedding
                     try:
-                        import json
-                        def _export_html_fallback(pdb_id, pdb_text, chain='A', resi=248, outdir=None):
+                        def _export_html_fallback(pdb_id, pdb_path, chain='A', resi=248, outdir=None):
                             if outdir is None:
                                 outdir = os.path.join(os.path.dirname(__file__), 'pdbs')
                             os.makedirs(outdir, exist_ok=True)
                             safe_id = str(pdb_id).lower()
                             html_path = os.path.join(outdir, f"{safe_id}_{resi}.html")
-                            pdb_js_string = json.dumps(pdb_text)
-                            html = """<!doctype html>
-<html>
-<head>
- <meta charset='utf-8'/>
- <title>3D View - {safe_id} res {resi}</title>
- <script src='https://3dmol.csb.pitt.edu/build/3Dmol-min.js'></script>
- <style>body {{ margin:0; padding:0; }} #viewer {{ width:100%; height:100vh; }}</style>
-</head>
-<body>
- <div id='viewer'></div>
- <script>
- var pdbData = {pdb_js_string};
- var viewer = $3Dmol.createViewer('viewer', {{backgroundColor: 'white'}});
- viewer.addModel(pdbData, 'pdb');
- viewer.setStyle({{}}, {{cartoon: {{color: 'spectrum'}}}});
- try {{
- viewer.addStyle({{chain: '{chain}', resi: {resi}}}, {{stick: {{colorscheme: 'magentaCarbon'}}, sphere: {{radius:1.0, color:'magenta'}}}});
- viewer.zoomTo({{chain: '{chain}', resi: {resi}}});
- }} catch(e) {{}}
- viewer.render();
- </script>
-</body>
-</html>""".format(pdb_js_string=pdb_js_string, safe_id=safe_id, chain=chain, resi=resi)
-                            with open(html_path, 'w', encoding='utf-8') as fh:
-                                fh.write(html)
-                            try:
-                                webbrowser.open('file://' + os.path.abspath(html_path))
-                            except Exception:
-                                pass
+                            # The PDB goes verbatim into a text/plain script block (read back via textContent),
+                            # streamed from the file: no json.dumps escaping and no in-memory copy of the text.
+                            head = _HTML_PRE.format(safe_id=safe_id, resi=resi)
+                            tail = _HTML_POST.format(chain=chain, resi=resi)
+                            with open(html_path, 'wb') as fh, open(pdb_path, 'rb') as src:
+                                fh.write(head.encode('utf-8'))
+                                shutil.copyfileobj(src, fh)
+                                fh.write(tail.encode('utf-8'))
+                            if open_in_browser:
+                                _open_in_browser(html_path)
                             return html_path
                         # call fallback exporter
-                        html_path = _export_html_fallback(pdb_id, pdb_text, chain=chain, resi=resi)
+                        html_path = _export_html_fallback(pdb_id, saved_path, chain=chain, resi=resi)
                         result['html'] = html_path
                     except Exception as e:
                         print('Fallback HTML generation failed:', e)
@@ -124,14 +154,38 @@ def try_visualize_event(pdb_id='2OCJ', chain='A', resi=248, mutation='R248W'):
     return result
 
 
+_MASK64 = 0xffffffffffffffff
+
+
+def _splitmix64(x):
+    """SplitMix64 output function on a 64-bit integer."""
+    x = ((x ^ (x >> 30)) * 0xbf58476d1ce4e5b9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94d049bb133111eb) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _mix64(value):
+    """SplitMix64 mix of the UTF-8 bytes of str(value), folded 8 bytes at a time.
+    Unlike hash() it does not depend on PYTHONHASHSEED, so it is stable across runs.
+    """
+    data = str(value).encode('utf-8')
+    x = len(data)
+    for i in range(0, len(data), 8):
+        x = _splitmix64(x ^ int.from_bytes(data[i:i + 8], 'little'))
+    return x
+
+
 def map_X_to_residue(X_value, protein_length=393, offset=0):
     """Deterministic mapping from integer GLC state Xn to residue index in [1, protein_length].
     offset allows shifting the mapping reproducibly.
     """
-    try:
-        xv = int(X_value)
-    except Exception:
-        xv = abs(hash(str(X_value)))
+    if isinstance(X_value, int):
+        xv = X_value
+    else:
+        try:
+            xv = int(X_value)
+        except Exception:
+            xv = _mix64(X_value)
     return (xv + int(offset)) % int(protein_length) + 1
 
 
@@ -157,7 +211,8 @@ def main(args):
     ev = events[0]
     target_residue = int(ev.get('mapped_residue', args.residue))
     print(f"\nAttempting to visualize first detected event mapped to residue {target_residue}.")
-    viz = try_visualize_event(pdb_id=args.pdb_id, chain=args.chain, resi=target_residue, mutation=args.mutation)
+    viz = try_visualize_event(pdb_id=args.pdb_id, chain=args.chain, resi=target_residue, mutation=args.mutation,
+                              open_in_browser=not args.no_browser)
 
     if viz.get('view_available'):
         print('Visualizer available. If running in a Jupyter Notebook, import and call visualize_mutation or run this script there to see the 3D view.')
@@ -206,10 +261,7 @@ def main(args):
             fh.write('\n'.join(parts))
 
         if open_in_browser:
-            try:
-                webbrowser.open('file://' + os.path.abspath(dashboard_path))
-            except Exception:
-                pass
+            _open_in_browser(dashboard_path)
 
         print('Dashboard HTML salvo em:', dashboard_path)
         return dashboard_path
@@ -229,7 +281,7 @@ def main(args):
     # If html3d is None but saved_pdb exists and export_html_view is available, user will already have been provided with HTML
     if png_path or html3d:
         try:
-            dashboard_file = export_dashboard_html(png_path, html3d)
+            dashboard_file = export_dashboard_html(png_path, html3d, open_in_browser=not args.no_browser)
         except Exception as e:
             print('Falha ao gerar dashboard HTML:', e)
 
@@ -251,6 +303,7 @@ if __name__ == '__main__':
     parser.add_argument('--mutation', type=str, default='R248W', help='Mutation label')
     parser.add_argument('--protein_length', type=int, default=393, help='Protein length for mapping Xn -> residue')
     parser.add_argument('--mapping_offset', type=int, default=0, help='Offset added to Xn before modulus to change mapping')
+    parser.add_argument('--no-browser', action='store_true', help='Do not open the generated HTML files (batch/CI runs)')
 
     args = parser.parse_args()
     sys.exit(main(args))
@@ -1,19 +1,59 @@
 # MIT License (c)2025 Andre Galberto - see LICENSE.md for full text
 import os
-import random
+import math
+import mmap
+import re
 import hashlib
 import numpy as np
 import json
 import tempfile
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 
-# Try to import TensorFlow/Keras; fall back to a dummy predictor if not available
+# TensorFlow/Keras is imported lazily, on the first model load or creation: the import
+# costs seconds and hundreds of MB that hash-fallback runs never need.
+# TF_AVAILABLE stays None until _importar_tf() has tried the import.
+TF_AVAILABLE = None
+tf = None
+keras = None
+layers = None
+
+
+def _importar_tf():
+    """Import TensorFlow/Keras on first use; returns True when it is available."""
+    global TF_AVAILABLE, tf, keras, layers
+    if TF_AVAILABLE is None:
+        try:
+            import tensorflow as _tf
+            from tensorflow import keras as _keras
+            from tensorflow.keras import layers as _layers
+            tf, keras, layers = _tf, _keras, _layers
+            TF_AVAILABLE = True
+        except Exception:
+            TF_AVAILABLE = False
+    return TF_AVAILABLE
+
+# pyarrow is optional: used to write the history as a Parquet file
 try:
-    import tensorflow as tf
-    from tensorflow import keras
-    from tensorflow.keras import layers
-    TF_AVAILABLE = True
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
 except Exception:
-    TF_AVAILABLE = False
+    PYARROW_AVAILABLE = False
+
+# Optional import of numba: without it the mutation kernel still runs as plain Python
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except Exception:
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
 
 # Genetic code table (reuse)
 CODON_TABLE = {
@@ -27,81 +67,241 @@ CODON_TABLE = {
     'GAA':'E','GAG':'E','GGA':'G','GGC':'G','GGG':'G','GGT':'G'
 }
 
+# codon lookup: 3 bits per base (4 = anything but A/C/G/T), index b0<<6 | b1<<3 | b2
+_BASE_BITS = np.full(256, 4, dtype=np.intp)
+_BASE_BITS[[ord('A'), ord('C'), ord('G'), ord('T')]] = [0, 1, 2, 3]
+_CODON_LUT = np.full(512, ord('X'), dtype=np.uint8)
+for _codon, _aa in CODON_TABLE.items():
+    _b = [int(_BASE_BITS[ord(ch)]) for ch in _codon]
+    _CODON_LUT[(_b[0] << 6) | (_b[1] << 3) | _b[2]] = ord(_aa)
+_STOP = ord('_')
+
 AMINOACIDOS = 'ACDEFGHIKLMNPQRSTVWYX'
 CHAR_TO_INT = {char: i for i, char in enumerate(AMINOACIDOS)}
 VOCAB_SIZE = len(AMINOACIDOS)
 MAX_LEN = 50
+# bytes.translate table: byte -> vocabulary index (unknown characters map to 'X', the last entry)
+_CHAR_TRANS = bytes(CHAR_TO_INT.get(chr(b), VOCAB_SIZE-1) for b in range(256))
+_POSICOES = np.arange(MAX_LEN)
+# sequences per model call in IAClassi.classificar_lote
+LOTE_PREDICAO = 512
+# from this many proteins classificar_lote spreads its blocks over worker threads,
+# each with its own model; smaller lists are not worth loading extra models
+_MIN_PARALELO = 1000
+# fallback scores are memoized only for proteins up to this length
+_CACHE_MAX_LEN = 256
 
 # GLC params (example)
 GLC_A = 1664525
 GLC_C = 1013904223
 GLC_M = 2**32
 LIMIAR_MUTACAO = 0.02
+# integer form of the threshold: s / GLC_M < LIMIAR_MUTACAO  <=>  s < _LIMIAR_GLC
+_LIMIAR_GLC = math.ceil(LIMIAR_MUTACAO * GLC_M)
+
+# replacement table: row = base byte, the first _N_TROCA[row] columns are the candidates.
+# A/T/C/G choose among the 3 other bases; any other byte (N, lowercase, ...) among all 4.
+_BASES = 'ATCG'
+_TABELA_TROCA = np.empty((256, 4), dtype=np.uint8)
+_TABELA_TROCA[:] = np.frombuffer(_BASES.encode('ascii'), dtype=np.uint8)
+_N_TROCA = np.full(256, 4, dtype=np.int64)
+for _b in _BASES:
+    _TABELA_TROCA[ord(_b), :3] = np.frombuffer(_BASES.replace(_b, '').encode('ascii'), dtype=np.uint8)
+    _N_TROCA[ord(_b)] = 3
 
 
 def gerar_numero_aleatorio(x_n, a=GLC_A, c=GLC_C, m=GLC_M):
     return (a * int(x_n) + c) % m
 
 
-def escolher_nova_base(original):
-    bases = ["A","T","C","G"]
-    if original in bases:
-        bases.remove(original)
-    return random.choice(bases)
+@njit(cache=True, inline='always')
+def _mutar_linha(seq_u8, s, a, c, m, limiar, tabela, n_opcoes, out):
+    """GLC pass over the sequence: one draw per base, mutated where s < limiar.
+    The replacement column comes from the high bits of the following GLC state
+    (peeked, not consumed), so mutation positions match the scalar stream.
+    """
+    for j in range(seq_u8.shape[0]):
+        s = (a * s + c) % m
+        if s < limiar:
+            s2 = (a * s + c) % m
+            out[j] = tabela[seq_u8[j], (s2 >> 16) % n_opcoes[seq_u8[j]]]
+        else:
+            out[j] = seq_u8[j]
+
+
+@njit(cache=True, parallel=True)
+def _mutar_lote_nb(seq_u8, sementes, a, c, m, limiar, tabela, n_opcoes):
+    """One mutated copy of seq_u8 per seed: returns a (len(sementes), len(seq_u8)) uint8 matrix."""
+    out = np.empty((sementes.shape[0], seq_u8.shape[0]), dtype=np.uint8)
+    for i in prange(sementes.shape[0]):
+        _mutar_linha(seq_u8, sementes[i], a, c, m, limiar, tabela, n_opcoes, out[i])
+    return out
+
+
+def mutar_lote(sequencia, sementes):
+    """Apply aplicar_mutacoes for every seed at once; returns the uint8 matrix of mutants."""
+    seq_u8 = np.frombuffer(sequencia.encode('ascii'), dtype=np.uint8)
+    sementes = np.asarray(sementes, dtype=np.int64) & 0xffffffff
+    return _mutar_lote_nb(seq_u8, sementes, GLC_A, GLC_C, GLC_M, _LIMIAR_GLC, _TABELA_TROCA, _N_TROCA)
+
+
+def escolher_nova_base(original, estado):
+    """Replacement for base `original` mutated at GLC state `estado`.
+
+    Table lookup with the column taken from the next GLC draw, exactly as in
+    _mutar_linha, so the choice is reproducible from the seed (no random module).
+    """
+    linha = ord(original) & 0xff
+    coluna = (gerar_numero_aleatorio(estado) >> 16) % _N_TROCA[linha]
+    return chr(_TABELA_TROCA[linha, coluna])
 
 
 def aplicar_mutacoes(sequencia, semente_genetica):
-    nova = []
-    s = int(semente_genetica) & 0xffffffff
-    for base in sequencia:
-        s = gerar_numero_aleatorio(s)
-        prob = s / GLC_M
-        if prob < LIMIAR_MUTACAO:
-            nova.append(escolher_nova_base(base))
-        else:
-            nova.append(base)
-    return ''.join(nova)
+    nova = mutar_lote(sequencia, [int(semente_genetica) & 0xffffffff])
+    return nova[0].tobytes().decode('ascii')
+
+
+def traduzir_lote(dna_u8):
+    """Translate each row of a (n, L) uint8 DNA matrix; returns the list of proteins."""
+    n_cod = dna_u8.shape[1] // 3
+    bits = _BASE_BITS[dna_u8[:, :n_cod * 3]].reshape(dna_u8.shape[0], n_cod, 3)
+    aa = _CODON_LUT[(bits[:, :, 0] << 6) | (bits[:, :, 1] << 3) | bits[:, :, 2]]
+    # first stop codon per row; the sentinel column gives n_cod when there is none
+    stop = np.concatenate([aa == _STOP, np.ones((aa.shape[0], 1), dtype=bool)], axis=1)
+    fim = stop.argmax(axis=1)
+    return [aa[i, :fim[i]].tobytes().decode('ascii') for i in range(aa.shape[0])]
 
 
 def traduzir_para_proteina(dna):
-    prot = []
-    for i in range(0, (len(dna)//3)*3, 3):
-        codon = dna[i:i+3]
-        aa = CODON_TABLE.get(codon, 'X')
-        if aa == '_':
-            break
-        prot.append(aa)
-    return ''.join(prot)
+    dna_u8 = np.frombuffer(dna.encode('ascii'), dtype=np.uint8)
+    return traduzir_lote(dna_u8.reshape(1, -1))[0]
 
 
-def vetorizar_proteina(proteina_str):
-    int_seq = [CHAR_TO_INT.get(ch, VOCAB_SIZE-1) for ch in proteina_str]
-    padded = int_seq[:MAX_LEN] + [0]*(MAX_LEN - len(int_seq))
-    # one-hot
-    arr = np.zeros((1, MAX_LEN, VOCAB_SIZE), dtype=np.float32)
-    for i, idx in enumerate(padded):
-        if 0 <= idx < VOCAB_SIZE:
-            arr[0, i, idx] = 1.0
+def vetorizar_lote(proteinas):
+    """One-hot batch of shape (len(proteinas), MAX_LEN, VOCAB_SIZE); row k encodes proteinas[k]."""
+    # fixed-width rows padded with 'A' (index 0, as the model was built with),
+    # then a single translate maps the whole batch to indices in C
+    linhas = b''.join(p.encode('ascii', 'replace')[:MAX_LEN].ljust(MAX_LEN, b'A') for p in proteinas)
+    idx = np.frombuffer(linhas.translate(_CHAR_TRANS), dtype=np.uint8).reshape(len(proteinas), MAX_LEN)
+    # one-hot in one scatter
+    arr = np.zeros((len(proteinas), MAX_LEN, VOCAB_SIZE), dtype=np.float32)
+    arr[np.arange(len(proteinas))[:, None], _POSICOES, idx] = 1.0
     return arr
 
 
+def vetorizar_proteina(proteina_str):
+    return vetorizar_lote([proteina_str])
+
+
+class _ModeloTFLite:
+    """int8 TFLite classifier behind the same call interface as the Keras model.
+
+    Quantizes the one-hot input with the model's input scale/zero point and
+    returns float scores of shape (n, 1). The interpreter is not thread-safe,
+    so calls are serialized with a lock.
+    """
+
+    def __init__(self, caminho):
+        self.interp = tf.lite.Interpreter(model_path=caminho)
+        self.interp.allocate_tensors()
+        self._n = None
+        self._lock = threading.Lock()
+
+    def __call__(self, x, training=False):
+        with self._lock:
+            idx_in = self.interp.get_input_details()[0]['index']
+            if self._n != x.shape[0]:
+                self.interp.resize_tensor_input(idx_in, list(x.shape))
+                self.interp.allocate_tensors()
+                self._n = x.shape[0]
+            inp = self.interp.get_input_details()[0]
+            out = self.interp.get_output_details()[0]
+            scale, zero = inp['quantization']
+            if inp['dtype'] != np.float32 and scale:
+                # saturate to the integer range: astype alone would wrap around
+                lim = np.iinfo(inp['dtype'])
+                x = np.clip(np.round(x / scale + zero), lim.min, lim.max).astype(inp['dtype'])
+            self.interp.set_tensor(inp['index'], x)
+            self.interp.invoke()
+            y = self.interp.get_tensor(out['index'])
+            scale, zero = out['quantization']
+            if out['dtype'] != np.float32 and scale:
+                y = (y.astype(np.float32) - zero) * scale
+            return y
+
+
 class IAClassi:
-    def __init__(self, caminho_modelo=None):
+    def __init__(self, caminho_modelo=None, n_workers=None):
         self.model = None
-        if TF_AVAILABLE and caminho_modelo and os.path.exists(caminho_modelo):
+        self._cache = {}
+        self._caminho = None
+        self.n_workers = n_workers or os.cpu_count() or 1
+        # extra models for the worker threads, loaded on demand and reused across calls
+        self._modelos = queue.SimpleQueue()
+        if caminho_modelo and os.path.exists(caminho_modelo) and _importar_tf():
             try:
-                self.model = keras.models.load_model(caminho_modelo)
+                self.model = self._carregar(caminho_modelo)
+                self._caminho = caminho_modelo
             except Exception:
                 self.model = None
 
+    @staticmethod
+    def _carregar(caminho):
+        if caminho.endswith('.tflite'):
+            return _ModeloTFLite(caminho)
+        return keras.models.load_model(caminho)
+
     def classificar(self, proteina_str):
         if self.model is None:
             # fallback: reproducible pseudo-random score based on sequence
-            h = int(hashlib.sha256(proteina_str.encode('utf-8')).hexdigest()[:8], 16)
-            return (h % 1000) / 1000.0
-        x = vetorizar_proteina(proteina_str)
-        pred = self.model.predict(x, verbose=0)
-        return float(pred[0][0])
+            score = self._cache.get(proteina_str)
+            if score is None:
+                # first 4 digest bytes as a big-endian int (same value as the old hexdigest()[:8])
+                d = hashlib.sha256(proteina_str.encode('utf-8')).digest()
+                score = (int.from_bytes(d[:4], 'big') % 1000) / 1000.0
+                if len(proteina_str) <= _CACHE_MAX_LEN:
+                    self._cache[proteina_str] = score
+            return score
+        return self.classificar_lote([proteina_str])[0]
+
+    def classificar_lote(self, proteinas, cancer_type=None):
+        """Score a list of proteins with one model call per LOTE_PREDICAO sequences.
+        Lists of _MIN_PARALELO or more proteins are scored on up to n_workers threads.
+        With cancer_type the scores get the classificar_por_contexto overlay.
+        """
+        if self.model is None:
+            scores = [self.classificar(p) for p in proteinas]
+        else:
+            blocos = [proteinas[k:k + LOTE_PREDICAO] for k in range(0, len(proteinas), LOTE_PREDICAO)]
+            n = min(self.n_workers, len(blocos))
+            if len(proteinas) >= _MIN_PARALELO and n > 1 and self._caminho:
+                # neither Keras models nor the TFLite interpreter are safe to call
+                # concurrently, so every worker borrows a model of its own
+                with ThreadPoolExecutor(max_workers=n) as ex:
+                    partes = list(ex.map(self._prever_bloco_emprestado, blocos))
+            else:
+                partes = [self._prever_bloco(b, self.model) for b in blocos]
+            scores = [sc for parte in partes for sc in parte]
+        if cancer_type:
+            scores = [self._ajustar_por_contexto(p, sc, cancer_type) for p, sc in zip(proteinas, scores)]
+        return scores
+
+    def _prever_bloco(self, proteinas, model):
+        x = vetorizar_lote(proteinas)
+        # direct call instead of model.predict: no per-call predict loop setup
+        pred = model(x, training=False)
+        return np.asarray(pred).ravel().tolist()
+
+    def _prever_bloco_emprestado(self, proteinas):
+        """_prever_bloco on a model taken from the worker pool (loaded if none is free)."""
+        try:
+            model = self._modelos.get_nowait()
+        except queue.Empty:
+            model = self._carregar(self._caminho)
+        try:
+            return self._prever_bloco(proteinas, model)
+        finally:
+            self._modelos.put(model)
 
     def classificar_por_contexto(self, proteina_str, cancer_type=""):
         """Classify with optional tumor-type context adjustments.
@@ -111,7 +311,10 @@ class IAClassi:
         indicate activation sites. This is a simple heuristic overlay on the
         base model score.
         """
-        base_score = self.classificar(proteina_str)
+        return self._ajustar_por_contexto(proteina_str, self.classificar(proteina_str), cancer_type)
+
+    @staticmethod
+    def _ajustar_por_contexto(proteina_str, base_score, cancer_type):
         if cancer_type and 'leucemia' in cancer_type.lower():
             # simple heuristic: increase scores when Tyr (Y) or Phe (F) present
             if 'Y' in proteina_str or 'F' in proteina_str:
@@ -120,8 +323,35 @@ class IAClassi:
         return min(float(base_score), 1.0)
 
 
+def converter_para_tflite(model, caminho_tflite, n_amostras=200):
+    """Convert a Keras classifier to a full-integer (int8) TFLite file.
+
+    Calibration uses random proteins encoded with vetorizar_proteina. The input
+    tensor is int8 (4x less data than the float32 one-hot); the score stays float.
+    """
+    if not _importar_tf():
+        raise RuntimeError('TensorFlow not available in this environment')
+    rng = np.random.default_rng(0)
+    letras = list(AMINOACIDOS[:-1])
+
+    def amostras():
+        for _ in range(n_amostras):
+            prot = ''.join(rng.choice(letras, size=int(rng.integers(1, MAX_LEN + 1))))
+            yield [vetorizar_proteina(prot)]
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = amostras
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    with open(caminho_tflite, 'wb') as fh:
+        fh.write(converter.convert())
+    return caminho_tflite
+
+
 def criar_e_salvar_modelo_exemplo(caminho_arquivo):
-    if not TF_AVAILABLE:
+    """Build the example Conv1D model; a .tflite path saves it quantized to int8."""
+    if not _importar_tf():
         raise RuntimeError('TensorFlow not available in this environment')
     input_shape = (MAX_LEN, VOCAB_SIZE)
     model = keras.Sequential([
@@ -132,25 +362,45 @@ def criar_e_salvar_modelo_exemplo(caminho_arquivo):
         layers.Dense(1, activation='sigmoid')
     ])
     model.compile(optimizer='adam', loss='binary_crossentropy')
-    model.save(caminho_arquivo)
+    if caminho_arquivo.endswith('.tflite'):
+        converter_para_tflite(model, caminho_arquivo)
+    else:
+        model.save(caminho_arquivo)
+
+
+# FASTA scanning: a header is a line whose first non-blank character is '>'
+_FASTA_CABECALHO = re.compile(rb'[ \t\r\v\f]*>[^\n]*\n?')
+_FASTA_PROX_CABECALHO = re.compile(rb'\n[ \t\r\v\f]*>')
 
 
 def _read_first_fasta_sequence(path):
-    """Read first sequence (concatenate lines) from a FASTA file."""
-    seq = []
+    """Read first sequence (concatenate lines) from a FASTA file.
+
+    The file is memory-mapped, so only the pages up to the end of the first
+    record are touched and only that record is copied, whatever the file size.
+    """
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                if line.startswith('>'):
-                    if seq:
-                        break
-                    else:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ''
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                n = len(data)
+                i = 0
+                while i < n:
+                    cab = _FASTA_CABECALHO.match(data, i)
+                    if cab:
+                        # header line (leading blanks allowed): skip it
+                        i = cab.end()
                         continue
-                seq.append(line.upper())
-        return ''.join(seq)
+                    # sequence block runs until the next header line
+                    prox = _FASTA_PROX_CABECALHO.search(data, i)
+                    end = prox.start() if prox else n
+                    # whitespace removal and upper-casing both run in C over the whole block
+                    seq = data[i:end].translate(None, b' \t\r\n\v\f').upper()
+                    if seq or prox is None:
+                        return seq.decode('utf-8')
+                    i = end + 1
+        return ''
     except Exception:
         return None
 
@@ -171,15 +421,18 @@ def run_simulation(caminho_modelo_ia, n_mutacoes=100, dna_sequence=None, cancer_
     melhor_proteina = proteina_original
     melhor_impacto = impacto_original
     history = []
-    for i in range(n_mutacoes):
-        dna_mut = aplicar_mutacoes(sequencia_epitopo_dna, semente_paciente + i)
-        prot = traduzir_para_proteina(dna_mut)
-        if not prot or prot == proteina_original:
-            continue
-        if cancer_type:
-            impacto = ia.classificar_por_contexto(prot, cancer_type=cancer_type)
-        else:
-            impacto = ia.classificar(prot)
+    # all mutants in one kernel call; row i is aplicar_mutacoes(seq, semente_paciente + i)
+    mutantes = mutar_lote(sequencia_epitopo_dna, semente_paciente + np.arange(n_mutacoes, dtype=np.int64))
+    proteinas = traduzir_lote(mutantes)
+    candidatos = [i for i in range(n_mutacoes) if proteinas[i] and proteinas[i] != proteina_original]
+    # identical mutants are frequent (short epitope, low LIMIAR_MUTACAO): one batched
+    # classification over the distinct proteins only, then a dict lookup per mutant
+    unicas = list(dict.fromkeys(proteinas[i] for i in candidatos))
+    seen = dict(zip(unicas, ia.classificar_lote(unicas, cancer_type=cancer_type)))
+    for i in candidatos:
+        dna_mut = mutantes[i].tobytes().decode('ascii')
+        prot = proteinas[i]
+        impacto = seen[prot]
         history.append({'i': i, 'dna': dna_mut, 'prot': prot, 'impacto': impacto})
         if impacto > melhor_impacto:
             melhor_impacto = impacto
@@ -194,12 +447,20 @@ def run_simulation(caminho_modelo_ia, n_mutacoes=100, dna_sequence=None, cancer_
     return result
 
 
+def salvar_historico_parquet(history, path):
+    """Write the history list (one dict per iteration) as a snappy Parquet file."""
+    table = pa.Table.from_pylist(history)
+    pq.write_table(table, path, compression='snappy')
+
+
 if __name__ == '__main__':
     import argparse
+    import importlib.util
     parser = argparse.ArgumentParser(description='Simular engenharia de anticorpo com IA (exemplo)')
     parser.add_argument('--model', default='modelo_anticorpo_corretivo.keras')
     parser.add_argument('--n', type=int, default=100)
     parser.add_argument('--out-json', type=str, default=None, help='Optional path to write JSON result')
+    parser.add_argument('--out-parquet', type=str, default=None, help='Optional path to write the history as Parquet (JSON then keeps only the summary)')
     parser.add_argument('--dna-file', type=str, default=None, help='Path to FASTA file to use as input DNA sequence (first seq)')
     parser.add_argument('--cancer-type', type=str, default=None, help='Optional cancer type context (e.g. leucemia)')
     args = parser.parse_args()
@@ -210,18 +471,32 @@ if __name__ == '__main__':
             dna_seq = None
     else:
         dna_seq = None
-    if not os.path.exists(args.model) and TF_AVAILABLE:
+    # find_spec only locates the package; TensorFlow is imported when the model is built
+    if not os.path.exists(args.model) and importlib.util.find_spec('tensorflow') is not None:
         try:
             criar_e_salvar_modelo_exemplo(args.model)
             print('Modelo de exemplo criado:', args.model)
         except Exception as e:
             print('Falha ao criar modelo exemplo:', e)
     res = run_simulation(args.model, n_mutacoes=args.n, dna_sequence=dna_seq, cancer_type=args.cancer_type)
+    # write the history as Parquet if requested; the JSON then only points to it
+    res_json = res
+    if args.out_parquet:
+        if not PYARROW_AVAILABLE:
+            print('pyarrow not available; history stays in the JSON result')
+        else:
+            try:
+                salvar_historico_parquet(res['history'], args.out_parquet)
+                res_json = {k: v for k, v in res.items() if k != 'history'}
+                res_json['history_parquet'] = os.path.abspath(args.out_parquet)
+                print(f'RESULT_PARQUET: {args.out_parquet}')
+            except Exception as e:
+                print(f'Falha ao escrever Parquet: {e}')
     # write JSON result if requested
     if args.out_json:
         try:
             with open(args.out_json, 'w', encoding='utf-8') as jf:
-                json.dump(res, jf, ensure_ascii=False, indent=2)
+                json.dump(res_json, jf, ensure_ascii=False, indent=2)
             print(f'RESULT_JSON: {args.out_json}')
         except Exception as e:
             print(f'Falha ao escrever JSON: {e}')
@@ -0,0 +1,107 @@
+# MIT License (c)2025 Andre Galberto - see LICENSE.md for full text
+import sys
+import types
+import wave
+
+import numpy as np
+import pytest
+
+import generate_midi as gm
+
+
+class _SynthFalso:
+    """Stand-in for fluidsynth.Synth: records every call, get_samples returns a running counter."""
+
+    def __init__(self, samplerate=44100.0):
+        self.samplerate = samplerate
+        self.chamadas = []
+        self.n_amostras = 0
+
+    def __getattr__(self, nome):
+        def registrar(*args):
+            self.chamadas.append((nome,) + args)
+        return registrar
+
+    def sfload(self, caminho):
+        self.chamadas.append(('sfload', caminho))
+        return 7
+
+    def get_samples(self, n):
+        self.chamadas.append(('get_samples', n))
+        # interleaved stereo, like pyfluidsynth: 2 * n int16 values
+        amostras = np.arange(self.n_amostras, self.n_amostras + 2 * n) % 30000
+        self.n_amostras += 2 * n
+        return amostras.astype(np.int16)
+
+
+@pytest.fixture
+def synth(monkeypatch):
+    sinths = []
+
+    def criar(samplerate):
+        sinths.append(_SynthFalso(samplerate))
+        return sinths[-1]
+    monkeypatch.setattr(gm, 'fluidsynth', types.SimpleNamespace(Synth=criar), raising=False)
+    monkeypatch.setattr(gm, 'HAS_FLUIDSYNTH', True)
+    return sinths
+
+
+@pytest.fixture
+def arquivos(tmp_path):
+    sf2 = tmp_path / 'som.sf2'
+    sf2.write_bytes(b'')
+    mid = gm.save_midi_tracks(str(tmp_path / 'a.mid'), [
+        gm.encode_track_from_notes([{'note': 60, 'start': 0, 'duration': 480, 'velocity': 90},
+                                    {'note': 38, 'start': 480, 'duration': 240}], channel=9),
+    ])
+    return str(sf2), mid
+
+
+def _ler_wav(caminho):
+    with wave.open(caminho, 'rb') as wf:
+        assert (wf.getnchannels(), wf.getsampwidth(), wf.getframerate()) == (2, 2, 1000)
+        return np.frombuffer(wf.readframes(wf.getnframes()), dtype='<i2')
+
+
+def test_renderer_carrega_soundfont_uma_vez_e_toca_as_notas(synth, arquivos, tmp_path):
+    sf2, mid = arquivos
+    with gm.FluidSynthRenderer(sf2, sample_rate=1000, tail_seconds=0.5) as r:
+        outs = r.render_many([(mid, str(tmp_path / 'a.wav')), (mid, str(tmp_path / 'b.wav'))])
+    (s,) = synth
+    assert s.samplerate == 1000.0
+    assert [c for c in s.chamadas if c[0] == 'sfload'] == [('sfload', sf2)]
+    assert ('program_select', 9, 7, 128, 0) in s.chamadas
+    notas = [c for c in s.chamadas if c[0] in ('noteon', 'noteoff')]
+    # 480 ticks at the default 120 BPM / 480 tpb = 0.5 s = 500 frames at 1 kHz
+    assert notas == [('noteon', 9, 60, 90), ('noteoff', 9, 60), ('noteon', 9, 38, 64), ('noteoff', 9, 38)] * 2
+    frames = [c[1] for c in s.chamadas if c[0] == 'get_samples']
+    # per MIDI: up to the note_off at 0.5 s, to the one at 0.75 s, then the 0.5 s tail
+    assert frames == [500, 250, 500] * 2
+    assert s.chamadas[-1] == ('delete',)
+    # each WAV holds exactly the samples the synth produced for its MIDI
+    a, b = (_ler_wav(o) for o in outs)
+    np.testing.assert_array_equal(a, np.arange(0, 2 * 1250))
+    np.testing.assert_array_equal(b, np.arange(2 * 1250, 2 * 2500))
+
+
+def test_cli_render_wav(synth, arquivos, tmp_path, monkeypatch, capsys):
+    sf2, mid = arquivos
+    monkeypatch.setattr(sys, 'argv', ['generate_midi.py', '--out', str(tmp_path / 'exemplo.mid'),
+                                      '--soundfont', sf2, '--render-wav', mid])
+    gm.parse_args_and_run()
+    assert (tmp_path / 'a.wav').is_file()
+    assert len(synth) == 1
+    assert f'WAV renderizado: {tmp_path / "a.wav"}' in capsys.readouterr().out
+
+
+def test_cli_render_wav_exige_soundfont(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['generate_midi.py', '--out', str(tmp_path / 'x.mid'), '--render-wav', 'a.mid'])
+    with pytest.raises(SystemExit):
+        gm.parse_args_and_run()
+    assert not (tmp_path / 'x.mid').exists()
+
+
+def test_renderer_sem_pyfluidsynth(monkeypatch, arquivos):
+    monkeypatch.setattr(gm, 'HAS_FLUIDSYNTH', False)
+    with pytest.raises(RuntimeError):
+        gm.FluidSynthRenderer(arquivos[0])
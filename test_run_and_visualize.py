@@ -0,0 +1,49 @@
+# MIT License (c)2025 Andre Galberto - see LICENSE.md for full text
+import os
+import subprocess
+import sys
+
+import pytest
+
+import run_and_visualize as rv
+
+
+def test_splitmix64_sequencia_de_referencia():
+    # reference SplitMix64 outputs for seed 0 (state advanced by the golden gamma)
+    estado = 0
+    saidas = []
+    for _ in range(3):
+        estado = (estado + 0x9e3779b97f4a7c15) & rv._MASK64
+        saidas.append(rv._splitmix64(estado))
+    assert saidas == [0xe220a8397b1dcdaf, 0x6e789e6aa1b965f4, 0x06c45d188009454f]
+
+
+@pytest.mark.parametrize('valor, esperado', [
+    ('abc', 0xfc0f22c9ac18f1e6),
+    ('R248W', 0x0e0fd42b13d2f752),
+    ('x' * 20, 0xc3b4b6653e4bb519),   # three 8-byte blocks
+    ('ção', 0x96c45e3be34cccd0),      # non-ASCII: mixed as UTF-8 bytes
+])
+def test_mix64_valores_fixos(valor, esperado):
+    assert rv._mix64(valor) == esperado
+
+
+def test_map_x_fallback_independe_do_hash_seed():
+    # non-numeric values go through _mix64; the residue must not change with PYTHONHASHSEED
+    codigo = 'import run_and_visualize as rv; print([rv.map_X_to_residue(v) for v in ("abc", "R248W", "x" * 20)])'
+    saidas = set()
+    for semente in ('0', '1', '12345'):
+        env = dict(os.environ, PYTHONHASHSEED=semente)
+        saidas.add(subprocess.run([sys.executable, '-c', codigo], env=env, cwd=os.path.dirname(rv.__file__) or '.',
+                                  capture_output=True, text=True, check=True).stdout.strip().splitlines()[-1])
+    assert saidas == {'[195, 198, 138]'}
+
+
+@pytest.mark.parametrize('comprimento, offset', [(393, 0), (393, 17), (1, 0), (7, -3)])
+def test_map_x_fallback_dentro_da_faixa(comprimento, offset):
+    for k in range(500):
+        valor = f'evento-{k}'
+        residuo = rv.map_X_to_residue(valor, protein_length=comprimento, offset=offset)
+        assert 1 <= residuo <= comprimento
+        assert residuo == rv.map_X_to_residue(valor, protein_length=comprimento, offset=offset)
+        assert residuo == (rv._mix64(valor) + offset) % comprimento + 1
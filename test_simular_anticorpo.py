@@ -0,0 +1,208 @@
+# MIT License (c)2025 Andre Galberto - see LICENSE.md for full text
+import threading
+import time
+import types
+
+import numpy as np
+import pytest
+
+import simular_anticorpo as sa
+
+
+class _InterpreterFalso:
+    """Stand-in for tf.lite.Interpreter: records the input tensor, returns a fixed int8 output."""
+
+    def __init__(self, model_path, in_dtype=np.int8, in_quant=(1.0 / 255, -128), out_quant=(1.0 / 256, -128)):
+        self.in_dtype = in_dtype
+        self.in_quant = in_quant
+        self.out_quant = out_quant
+        self.shape = [1, sa.MAX_LEN, sa.VOCAB_SIZE]
+        self.recebido = None
+
+    def allocate_tensors(self):
+        pass
+
+    def resize_tensor_input(self, index, shape):
+        self.shape = list(shape)
+
+    def get_input_details(self):
+        return [{'index': 0, 'dtype': self.in_dtype, 'quantization': self.in_quant, 'shape': self.shape}]
+
+    def get_output_details(self):
+        return [{'index': 1, 'dtype': np.int8, 'quantization': self.out_quant}]
+
+    def set_tensor(self, index, x):
+        assert x.dtype == self.in_dtype
+        assert list(x.shape) == self.shape
+        self.recebido = x
+
+    def invoke(self):
+        pass
+
+    def get_tensor(self, index):
+        return np.zeros((self.shape[0], 1), dtype=np.int8)
+
+
+def _modelo(monkeypatch, **kw):
+    interp = _InterpreterFalso(None, **kw)
+    monkeypatch.setattr(sa, 'tf', types.SimpleNamespace(lite=types.SimpleNamespace(Interpreter=lambda model_path: interp)))
+    return sa._ModeloTFLite('modelo.tflite'), interp
+
+
+def test_tflite_quantiza_entrada_e_dequantiza_saida(monkeypatch):
+    modelo, interp = _modelo(monkeypatch)
+    x = sa.vetorizar_lote(['CAR', 'YW'])
+    y = modelo(x)
+    # one-hot 1.0 -> 127, 0.0 -> -128 with scale 1/255 and zero point -128
+    assert interp.recebido.shape == x.shape
+    assert set(np.unique(interp.recebido[x == 1.0])) == {127}
+    assert set(np.unique(interp.recebido[x == 0.0])) == {-128}
+    # int8 0 output with scale 1/256 and zero point -128 is a score of 0.5
+    assert y.dtype == np.float32
+    np.testing.assert_array_equal(y, np.full((2, 1), 0.5, dtype=np.float32))
+
+
+@pytest.mark.parametrize('dtype, quant, esperado', [
+    (np.int8, (1.0 / 300, 0), (127, 0)),      # 1.0 -> 300: saturates at int8 max
+    (np.int8, (0.5, -127), (-125, -127)),     # zero point close to the minimum
+    (np.uint8, (1.0 / 512, 10), (255, 10)),   # 1.0 -> 522: saturates at uint8 max
+])
+def test_tflite_satura_fora_da_faixa(monkeypatch, dtype, quant, esperado):
+    modelo, interp = _modelo(monkeypatch, in_dtype=dtype, in_quant=quant)
+    x = sa.vetorizar_proteina('CAR')
+    modelo(x)
+    um, zero = esperado
+    assert set(np.unique(interp.recebido[x == 1.0])) == {um}
+    assert set(np.unique(interp.recebido[x == 0.0])) == {zero}
+
+
+def _trocas(seq, sementes):
+    """(original, new) base pairs at every mutated position of aplicar_mutacoes over the seeds."""
+    pares = []
+    for semente in sementes:
+        nova = sa.aplicar_mutacoes(seq, semente)
+        pares.extend((o, n) for o, n in zip(seq, nova) if o != n)
+    return pares
+
+
+def test_mutacao_acgt_troca_por_outra_base():
+    pares = _trocas('ACGT' * 50, range(300))
+    assert pares
+    for original in 'ACGT':
+        novas = {n for o, n in pares if o == original}
+        assert novas == set('ACGT') - {original}
+
+
+@pytest.mark.parametrize('original', ['N', 'a', 'x'])
+def test_mutacao_base_fora_de_acgt_usa_as_quatro_bases(original):
+    # as in the original random.choice(["A","T","C","G"]) path: all four bases can be drawn
+    pares = _trocas(original * 200, range(300))
+    assert {n for _, n in pares} == set('ACGT')
+
+
+def test_mutacao_reprodutivel():
+    seq = 'TGTGCGAGAGATAGCAGCAACTGGTTTGCTTAC' * 5 + 'NNNN'
+    assert sa.aplicar_mutacoes(seq, 12345) == sa.aplicar_mutacoes(seq, 12345)
+
+
+def _mutacao_escalar(seq, semente):
+    """Scalar loop over escolher_nova_base, the reference for aplicar_mutacoes."""
+    nova = []
+    s = semente & 0xffffffff
+    for base in seq:
+        s = sa.gerar_numero_aleatorio(s)
+        nova.append(sa.escolher_nova_base(base, s) if s / sa.GLC_M < sa.LIMIAR_MUTACAO else base)
+    return ''.join(nova)
+
+
+def test_escolher_nova_base_igual_ao_kernel():
+    seq = 'ACGTNacgt' * 40
+    for semente in range(200):
+        assert _mutacao_escalar(seq, semente) == sa.aplicar_mutacoes(seq, semente)
+
+
+@pytest.mark.parametrize('original', ['N', 'a'])
+def test_escolher_nova_base_fora_de_acgt(original):
+    novas = {sa.escolher_nova_base(original, estado) for estado in range(0, 2**32, 2**32 // 4000)}
+    assert novas == set('ACGT')
+
+
+def test_escolher_nova_base_acgt():
+    for original in 'ACGT':
+        novas = {sa.escolher_nova_base(original, estado) for estado in range(0, 2**32, 2**32 // 4000)}
+        assert novas == set('ACGT') - {original}
+
+
+@pytest.mark.parametrize('conteudo, esperado', [
+    ('>seq1\nACGT\nacgt\n>seq2\nTTTT\n', 'ACGTACGT'),
+    ('>seq1\r\nAC GT\r\n\r\nGG\r\n>seq2\r\nTT\r\n', 'ACGTGG'),
+    ('  >seq1 indented header\nACGT\n\t>seq2\nTTTT\n', 'ACGT'),
+    ('>h1\n>h2\n\n   \nCCA\n  >h3\nGG', 'CCA'),
+    ('ACGT\n>seq2\nTT\n', 'ACGT'),
+    ('>so o cabecalho\n', ''),
+    ('', ''),
+])
+def test_read_first_fasta_sequence(tmp_path, conteudo, esperado):
+    fasta = tmp_path / 'seq.fasta'
+    fasta.write_bytes(conteudo.encode('utf-8'))
+    assert sa._read_first_fasta_sequence(str(fasta)) == esperado
+
+
+def test_read_first_fasta_sequence_arquivo_ausente(tmp_path):
+    assert sa._read_first_fasta_sequence(str(tmp_path / 'nao_existe.fasta')) is None
+
+
+class _ModeloFalso:
+    """Deterministic stand-in model that fails if two threads call it at once."""
+
+    def __init__(self):
+        self._ocupado = threading.Lock()
+        self.chamadas = 0
+
+    def __call__(self, x, training=False):
+        assert self._ocupado.acquire(blocking=False), 'model called concurrently'
+        try:
+            self.chamadas += 1
+            time.sleep(0.001)
+            pesos = np.arange(1, sa.VOCAB_SIZE + 1, dtype=np.float32)
+            return ((x * pesos).sum(axis=(1, 2)) % 97 / 97.0).reshape(-1, 1)
+        finally:
+            self._ocupado.release()
+
+
+def _classificador(monkeypatch, n_workers):
+    carregados = []
+
+    def carregar(caminho):
+        carregados.append(_ModeloFalso())
+        return carregados[-1]
+    monkeypatch.setattr(sa.IAClassi, '_carregar', staticmethod(carregar))
+    ia = sa.IAClassi(n_workers=n_workers)
+    ia.model, ia._caminho = carregar('modelo.keras'), 'modelo.keras'
+    return ia, carregados
+
+
+def _proteinas(n):
+    rng = np.random.default_rng(7)
+    return [''.join(rng.choice(list(sa.AMINOACIDOS), size=rng.integers(5, 40))) for _ in range(n)]
+
+
+def test_classificar_lote_paralelo_igual_ao_serial(monkeypatch):
+    proteinas = _proteinas(3 * sa.LOTE_PREDICAO + 17)
+    serial, _ = _classificador(monkeypatch, n_workers=1)
+    paralelo, carregados = _classificador(monkeypatch, n_workers=4)
+    esperado = serial.classificar_lote(proteinas, cancer_type='leucemia')
+    assert paralelo.classificar_lote(proteinas, cancer_type='leucemia') == esperado
+    # every block ran on a worker model, at most one per worker
+    assert paralelo.model.chamadas == 0
+    assert 2 <= len(carregados) <= 5
+    # the worker models are kept for the next call
+    assert paralelo.classificar_lote(proteinas, cancer_type='leucemia') == esperado
+    assert len(carregados) <= 5
+
+
+def test_classificar_lote_pequeno_fica_no_modelo_principal(monkeypatch):
+    ia, carregados = _classificador(monkeypatch, n_workers=4)
+    ia.classificar_lote(_proteinas(sa._MIN_PARALELO - 1))
+    assert len(carregados) == 1
+    assert ia.model.chamadas == 2
@@ -14,31 +14,27 @@ import tempfile
 import os
 import urllib.request
 from pathlib import Path
-import json
+import threading
 import webbrowser
 
 
-def export_html_view(pdb_id, pdb_text, chain='A', resi=248, mutation='R248W', width=800, height=600,
- outdir=None, open_in_browser=True):
- """Export a standalone HTML file with embedded3Dmol.js viewer showing the PDB.
+def _open_in_browser(path):
+ """Open a local file in the browser on a separate (non-daemon) thread, so the
+ caller does not wait for the browser launch and a CLI run does not drop it at exit."""
+ url = 'file://' + os.path.abspath(str(path))
 
- The HTML uses the3Dmol.js CDN and embeds the PDB text directly so it can be opened locally
- in a browser without a server. Returns the path to the generated HTML file.
- """
- if outdir is None:
- project_dir = Path(__file__).resolve().parent
- outdir = project_dir / 'pdbs'
- else:
- outdir = Path(outdir)
- outdir.mkdir(parents=True, exist_ok=True)
+ def _open():
+  try:
+   webbrowser.open(url)
+  except Exception:
+   pass
 
- safe_id = str(pdb_id).lower()
- html_path = outdir / f"{safe_id}_{resi}.html"
+ threading.Thread(target=_open, name='open-browser').start()
 
- # Use JSON encoding to safely embed the PDB text into JS string
- pdb_js_string = json.dumps(pdb_text)
 
- html = f"""<!doctype html>
+# Standalone page split around the PDB text, so the (possibly MB-sized) PDB is written
+# as-is between the two parts instead of being json-escaped and formatted into the template.
+HTML_PRE = """<!doctype html>
  <html>
  <head>
  <meta charset='utf-8'/>
@@ -48,8 +44,11 @@ def export_html_view(pdb_id, pdb_text, chain='A', resi=248, mutation='R248W', wi
  </head>
  <body>
  <div id='viewer'></div>
+ <script type='text/plain' id='pdb-data'>"""
+
+HTML_POST = """</script>
  <script>
- var pdbData = {pdb_js_string};
+ var pdbData = document.getElementById('pdb-data').textContent;
  var viewer = $3Dmol.createViewer('viewer', {{backgroundColor: 'white'}});
  viewer.addModel(pdbData, 'pdb');
  viewer.setStyle({{}}, {{cartoon: {{color: 'spectrum'}}}});
@@ -63,16 +62,49 @@ def export_html_view(pdb_id, pdb_text, chain='A', resi=248, mutation='R248W', wi
  </body>
  </html>"""
 
+
+def export_html_view(pdb_id, pdb_text, chain='A', resi=248, mutation='R248W', width=800, height=600,
+ outdir=None, open_in_browser=True):
+ """Export a standalone HTML file with embedded3Dmol.js viewer showing the PDB.
+
+ The HTML uses the3Dmol.js CDN and embeds the PDB text directly (in a text/plain script
+ block) so it can be opened locally in a browser without a server. Returns the path to the
+ generated HTML file.
+ """
+ if outdir is None:
+  project_dir = Path(__file__).resolve().parent
+  outdir = project_dir / 'pdbs'
+ else:
+  outdir = Path(outdir)
+ outdir.mkdir(parents=True, exist_ok=True)
+
+ safe_id = str(pdb_id).lower()
+ html_path = outdir / f"{safe_id}_{resi}.html"
+
  with open(html_path, 'w', encoding='utf-8') as fh:
- fh.write(html)
+  fh.write(HTML_PRE.format(safe_id=safe_id, resi=resi))
+  fh.write(pdb_text)
+  fh.write(HTML_POST.format(chain=chain, resi=resi))
 
  if open_in_browser:
- try:
- webbrowser.open('file://' + str(html_path))
- except Exception:
- pass
+  _open_in_browser(html_path)
 
  print(f'HTML salvo em: {html_path}')
  return str(html_path)
 
 # rest unchanged
+
+
+if __name__ == '__main__':
+ import argparse
+ parser = argparse.ArgumentParser(description='Export a standalone 3Dmol.js HTML view of a local PDB file')
+ parser.add_argument('pdb_file', help='Path to the PDB file')
+ parser.add_argument('--pdb-id', default=None, help='PDB ID used in the page title and file name (default: file name)')
+ parser.add_argument('--chain', default='A', help='Chain to highlight')
+ parser.add_argument('--resi', type=int, default=248, help='Residue number to highlight')
+ parser.add_argument('--outdir', default=None, help='Output folder (default: pdbs/ next to this script)')
+ parser.add_argument('--no-browser', action='store_true', help='Do not open the generated HTML file (batch/CI runs)')
+ args = parser.parse_args()
+ pdb_id = args.pdb_id or Path(args.pdb_file).stem
+ export_html_view(pdb_id, Path(args.pdb_file).read_bytes().decode('utf-8'), chain=args.chain, resi=args.resi,
+  outdir=args.outdir, open_in_browser=not args.no_browser)